@@ -4,14 +4,23 @@ import shutil
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from PIL import Image, ImageTk
+from io import BytesIO
 import pandas as pd
 import download_helper
+import image_cache
+import image_bundle
+import thumbnail_cache
 import csv
 from ttkthemes import ThemedTk
 import threading
 import datetime
 import tempfile
 import json 
+import queue
+import multiprocessing
+import concurrent.futures
+import bisect
+from collections import Counter, OrderedDict
 
 """
 Developed by Dave Nissly
@@ -31,6 +40,68 @@ Note: Setting wrong image makes it disappear from the audit flow and changes wil
 TEMP_FOLDER = "TEMP"
 LOGOS_FOLDER = "Logos"
 COLORS_FOLDER = "Colors"
+# Download engine: "threads" (thread pool) or "async" (single-thread asyncio, needs aiohttp)
+DOWNLOAD_ENGINE = "async" if download_helper.aiohttp is not None else "threads"
+DOWNLOAD_CONCURRENCY = download_helper.DEFAULT_ASYNC_CONCURRENCY
+# Persistent product image cache (survives session cleanup, lives outside TEMP)
+IMAGE_CACHE_FOLDER = image_cache.DEFAULT_CACHE_FOLDER
+IMAGE_CACHE_MAX_BYTES = image_cache.DEFAULT_MAX_BYTES
+# "always", "never" (trust the cache) or hours after which cached images are re-checked with a conditional GET
+IMAGE_CACHE_REVALIDATE = download_helper.DEFAULT_REVALIDATE_HOURS
+# Audit-order downloading: rows ahead of the current product fetched first, and how many
+# upcoming images must be ready before the audit view opens
+DOWNLOAD_LOOKAHEAD = download_helper.DEFAULT_LOOKAHEAD
+START_AUDIT_AFTER_READY = 3
+# Adaptive (AIMD) concurrency up to DOWNLOAD_CONCURRENCY, with an optional hard requests-per-second
+# ceiling per deployment (None = no ceiling)
+ADAPTIVE_CONCURRENCY = True
+MAX_REQUESTS_PER_SECOND = None
+# Hedged requests: a full-size request slower than the recent p95 gets a duplicate, sent to the next
+# mirror (URL templates equivalent to DEFAULT_BASE_URL, e.g. another CDN host or a local caching proxy);
+# the slower of the two is cancelled. Only used when a mirror is listed, so the production CDN never
+# gets duplicate GETs by default; set HEDGE_SLOW_REQUESTS = True to also hedge to the same URL.
+IMAGE_MIRRORS = []
+HEDGE_SLOW_REQUESTS = bool(IMAGE_MIRRORS)
+# Product image slot on the audit screen. The download workers write a copy at exactly this size,
+# so showing a product is a plain JPEG load; changing it regenerates copies lazily as rows are shown.
+PRODUCT_IMAGE_SIZE = (511, 730)
+# Two-tier fetch: thumbnails for the whole report alongside the full-size images, both in audit order and
+# sharing the limiter, so auditing can start almost at once; the full image replaces the preview when it arrives
+PREVIEW_FIRST = True
+PREVIEW_SIZE = download_helper.DEFAULT_PREVIEW_SIZE
+PREVIEW_CACHE_MAX_BYTES = image_cache.DEFAULT_PREVIEWS_MAX_BYTES
+# Sliding-window disk footprint for very large reports: only images for rows in
+# [index - DISK_WINDOW_HISTORY, index + DISK_WINDOW_AHEAD) are kept in the session folder; rows behind
+# the window are evicted and fetched again (usually from the image cache) if the auditor goes back.
+# Peak session usage is about (history + ahead) x ~150 KB, plus the image cache's own IMAGE_CACHE_MAX_BYTES.
+# Previews are skipped in this mode since the window keeps the next images close anyway.
+DISK_WINDOW = False
+DISK_WINDOW_AHEAD = 150
+DISK_WINDOW_HISTORY = 25
+# Failed downloads are retried in the background for the whole session (seconds before the first
+# retry, doubling up to the maximum); only images still failing at finish are written out as bad images
+DOWNLOAD_RETRY_DELAY = 15
+DOWNLOAD_RETRY_MAX_DELAY = 600
+# Alternate product views (back, detail, ...) offered next to the main image. They are fetched only
+# when asked for, or ahead of time for the product on screen and the next one, into their own cache.
+ALTERNATE_VIEWS = (2, 3)
+PREFETCH_ALTERNATE_VIEWS = True
+VIEW_CACHE_MAX_BYTES = image_cache.DEFAULT_VIEWS_MAX_BYTES
+# Logo and color swatch thumbnails: ready-to-draw images held in memory, pre-resized copies on disk
+# (the exit log reports the hit rate, to size THUMBNAIL_MEMORY_ITEMS)
+THUMBNAIL_FOLDER = os.path.join(IMAGE_CACHE_FOLDER, "thumbnails")
+THUMBNAIL_MEMORY_ITEMS = thumbnail_cache.DEFAULT_MEMORY_ITEMS
+ASSET_THUMBNAIL_SIZE = (200, 200)
+SELECTOR_THUMBNAIL_SIZE = (150, 150)
+# Rows ahead of the one on screen whose product image, logo and swatch are decoded on a worker thread,
+# so an arrow key only hands ready images to Tk (0 = decode on the Tk thread when a row is shown)
+PREDECODE_AHEAD = 5
+# Background rescaling on window resize: a fast preview while the edge is dragged, the LANCZOS pass once
+# resizing has paused this long, and the last few rendered sizes kept (maximize/restore and monitor moves)
+BG_RESIZE_DEBOUNCE_MS = 150
+BG_CACHED_SIZES = 4
+# Recompute the progress counters from scratch on every row shown and stop if they disagree (debugging only)
+DEBUG_AUDIT_STATE = False
 
 def resource_path(relative_path):
     """
@@ -42,6 +113,44 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
+class AssetIndex:
+    """
+    Lowercased file name -> path for one asset folder (Logos, Colors...). Built on first use and
+    rebuilt only when the folder's mtime changes, so a lookup is one stat plus a dict hit.
+    """
+    def __init__(self, folder):
+        self.folder = folder
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._files = None
+
+    def _refresh(self):
+        path = resource_path(self.folder)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._files is not None and mtime == self._mtime:
+            return
+        files = {}
+        if mtime is not None:
+            for file in os.listdir(path):
+                files.setdefault(file.lower(), os.path.join(path, file))
+        self._files, self._mtime = files, mtime
+
+    def lookup(self, file_name):
+        with self._lock:
+            self._refresh()
+            return self._files.get(file_name.lower())
+
+_asset_indexes = {}  # folder -> AssetIndex, shared by the audit view and the selection dialogs
+
+def asset_index(folder):
+    index = _asset_indexes.get(folder)
+    if index is None:
+        index = _asset_indexes.setdefault(folder, AssetIndex(folder))
+    return index
+
 def find_image(folder, base_name):
     """
     Looks for an image file (.jpg or .png, case-insensitive) in the given folder matching base_name.
@@ -49,12 +158,147 @@ def find_image(folder, base_name):
     """
     if not base_name or not isinstance(base_name, str):
         return None
+    index = asset_index(folder)
     for ext in ['.jpg', '.png']:
-        for file in os.listdir(resource_path(folder)):
-            if file.lower() == f"{base_name.lower()}{ext}":
-                return os.path.join(resource_path(folder), file)
+        path = index.lookup(f"{base_name}{ext}")
+        if path is not None:
+            return path
     return None
 
+class AuditState:
+    """
+    Progress counters for a session, updated on every mark, undo and download event so the
+    progress label reads them in O(1) however large the report or long the session:
+    audited rows, effective total (rows not set aside as wrong or failed images), remaining,
+    wrong-image names and rows with missing fields. verify() recomputes everything from scratch.
+    """
+    WRONG_IMAGE = "wrong_image"
+    FAILED = "failed"
+
+    def __init__(self, names=(), choices=(), wrong_image_names=(), failed_names=(), missing_indices=()):
+        self.name_rows = Counter(names)  # Name -> rows in the report
+        self.total = sum(self.name_rows.values())
+        self._entries = Counter()  # row index -> choices recorded for it
+        self._user_entries = Counter()  # row index -> user (not auto-rejected) choices recorded for it
+        self._audited = {}  # row index -> Name, rows with at least one user choice
+        self._audited_names = Counter()  # Name -> audited rows
+        self._excluded = {}  # Name -> reasons it is out of the audit flow (wrong image, failed download)
+        self.excluded_rows = 0
+        self._audited_excluded = 0
+        self.wrong_images = 0
+        self.missing = set(missing_indices)
+        for entry in choices:
+            self.record(entry)
+        for name in wrong_image_names:
+            self.exclude(name, self.WRONG_IMAGE)
+        for name in failed_names:
+            self.exclude(name, self.FAILED)
+
+    @staticmethod
+    def _row_name(row):
+        return str(row['Name']) if 'Name' in row else ""
+
+    # ---- choices ----
+    def record(self, entry):
+        idx = getattr(entry[1], "name", None)
+        self._entries[idx] += 1
+        if len(entry) < 3 or entry[2]:
+            return
+        self._user_entries[idx] += 1
+        if self._user_entries[idx] == 1:
+            name = self._row_name(entry[1])
+            self._audited[idx] = name
+            self._audited_names[name] += 1
+            if name in self._excluded:
+                self._audited_excluded += 1
+
+    def unrecord(self, entry):
+        idx = getattr(entry[1], "name", None)
+        self._entries[idx] -= 1
+        if not self._entries[idx]:
+            del self._entries[idx]
+        if len(entry) < 3 or entry[2]:
+            return
+        self._user_entries[idx] -= 1
+        if self._user_entries[idx]:
+            return
+        del self._user_entries[idx]
+        name = self._audited.pop(idx)
+        self._audited_names[name] -= 1
+        if name in self._excluded:
+            self._audited_excluded -= 1
+
+    def has_choice(self, idx):
+        return idx in self._entries
+
+    def name_audited(self, name):
+        # Every row of `name` has a user choice (e.g. judged from its preview)
+        return 0 < self.name_rows[name] <= self._audited_names[name]
+
+    # ---- rows set aside ----
+    def exclude(self, name, reason):
+        reasons = self._excluded.setdefault(name, set())
+        if reason in reasons:
+            return
+        if not reasons:
+            self.excluded_rows += self.name_rows[name]
+            self._audited_excluded += self._audited_names[name]
+        reasons.add(reason)
+        if reason == self.WRONG_IMAGE:
+            self.wrong_images += 1
+
+    def include(self, name, reason):
+        reasons = self._excluded.get(name)
+        if not reasons or reason not in reasons:
+            return
+        reasons.discard(reason)
+        if reason == self.WRONG_IMAGE:
+            self.wrong_images -= 1
+        if not reasons:
+            del self._excluded[name]
+            self.excluded_rows -= self.name_rows[name]
+            self._audited_excluded -= self._audited_names[name]
+
+    # ---- counters ----
+    @property
+    def audited(self):
+        return len(self._audited)
+
+    @property
+    def effective_total(self):
+        return self.total - self.excluded_rows
+
+    @property
+    def remaining(self):
+        return self.effective_total - (self.audited - self._audited_excluded)
+
+    def snapshot(self):
+        return {"audited": self.audited, "effective_total": self.effective_total, "remaining": self.remaining,
+                "wrong_images": self.wrong_images, "missing": len(self.missing)}
+
+    def verify(self, names, choices, wrong_image_names, failed_names, missing_indices):
+        """
+        Rebuilds the counters from the session's lists and raises AssertionError if any differs.
+        """
+        names = list(names)
+        expected = AuditState(names, choices, wrong_image_names, failed_names, missing_indices).snapshot()
+        # Full scans, as an independent check of the incremental bookkeeping (rows are indexed by position)
+        audited = {getattr(c[1], "name", None) for c in choices if len(c) >= 3 and not c[2]}
+        counted = [i for i, n in enumerate(names) if n not in wrong_image_names and n not in failed_names]
+        expected["audited"] = len(audited)
+        expected["effective_total"] = len(counted)
+        expected["remaining"] = sum(1 for i in counted if i not in audited)
+        actual = self.snapshot()
+        if actual != expected:
+            raise AssertionError(f"Audit counters out of sync: {actual} != {expected}")
+
+def _decode_product_image(source):
+    # Fully decoded and at the product slot size, so the Tk thread only has to wrap it in a PhotoImage
+    img = Image.open(source)
+    img.draft("RGB", PRODUCT_IMAGE_SIZE)  # JPEGs larger than the slot decode at a reduced scale
+    img.load()
+    return img if img.size == PRODUCT_IMAGE_SIZE else img.resize(PRODUCT_IMAGE_SIZE, reducing_gap=3.0)
+
 class AuditApp:
     def __init__(self, root):
         self.root = root
@@ -63,6 +307,7 @@ class AuditApp:
         self.data = None
         self.index = 0
         self.choices = []
+        self.audit_state = AuditState()
         self.images = []
         self.logo_imgs = []
         self.color_imgs = []
@@ -84,15 +329,72 @@ class AuditApp:
         self.completed = False
         # Track products marked as wrong image (parent Name values)
         self.wrong_image_names = set()
+        # Downloads that failed so far: Name -> latest failed DownloadResult (None if unknown).
+        # These rows sit out of the audit flow while the retry queue keeps trying.
+        self.download_failures = {}
+        self.retry_queue = None
+        self.late_rows = []  # row indices skipped for a failed image that has since arrived
+        self.late_row = None  # the late row being audited, if any
+        self.image_failure_reasons = {}  # Name -> reason, for images still failing at finish
+        self.download_reconciled = False
+        # Sliding disk window: Name -> row index for images currently in the session folder
+        self.on_disk = {}
+        self.name_to_row = {}
         # NEW: track download lifecycle and expected names
         self.download_done = False
         self.expected_names = []
+        # Per-image DownloadResult events from the download thread, drained by poll_progress
+        self.download_events = queue.Queue()
+        self.download_completed = 0
+        self.download_manifest = None
+        self.download_results = {}  # Name -> DownloadResult as events arrive
+        self.download_scheduler = None
+        # Preview tier (thumbnails fetched before the full-size run)
+        self.preview_events = queue.Queue()
+        self.preview_results = {}  # Name -> DownloadResult
+        self.preview_scheduler = None
+        self.preview_rows = None  # report rows the preview scheduler holds, in its order
+        self.preview_shown = None  # Name whose preview is on screen, waiting for the full image
+        self.download_limiter = None
+        self.download_hedger = download_helper.Hedger(IMAGE_MIRRORS) if HEDGE_SLOW_REQUESTS else None
+        self._image_wait_id = None
+        # Offline image bundle shipped next to the report CSV (see image_bundle.py), if any
+        self.image_bundle = None
         # Map each Name (parent or child) to its Internal ID from the original CSV
         self.name_to_internal_id = {}
         # Background image state
         self.bg_original = None
         self.bg_image_id = None
         self.tk_bg_img = None
+        self.bg_cache = OrderedDict()  # (width, height) -> PhotoImage at full quality, LRU first
+        self._bg_pending_size = None
+        self._bg_preview_id = None
+        self._bg_final_id = None
+        # Shared on-disk image cache across sessions
+        try:
+            self.image_cache = image_cache.ImageCache(IMAGE_CACHE_FOLDER, IMAGE_CACHE_MAX_BYTES)
+            self.view_cache = image_cache.ImageCache(os.path.join(IMAGE_CACHE_FOLDER, image_cache.VIEWS_SUBFOLDER),
+                                                     VIEW_CACHE_MAX_BYTES)
+            self.preview_cache = image_cache.ImageCache(os.path.join(IMAGE_CACHE_FOLDER, image_cache.PREVIEWS_SUBFOLDER),
+                                                        PREVIEW_CACHE_MAX_BYTES)
+        except OSError as e:
+            print(f"Image cache unavailable: {e}")
+            self.image_cache = None
+            self.view_cache = None
+            self.preview_cache = None
+        self.thumbnails = thumbnail_cache.ThumbnailCache(THUMBNAIL_FOLDER, THUMBNAIL_MEMORY_ITEMS, make_display=ImageTk.PhotoImage)
+        # Alternate views: fetched in the background, one Future per (Picture ID, view)
+        self.view_fetcher = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self.view_fetches = {}
+        # Display-variant generation for rows the download run did not cover (e.g. after a size change)
+        self.variant_maker = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.variant_jobs = set()
+        # Look-ahead decoding: Name -> Future of (image, source) for the next PREDECODE_AHEAD rows
+        self.predecoder = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.predecoded = {}
+        self.current_view = 1
+        self.displayed_row = None
+        self.row_items = None  # persistent canvas items for a product row (see _row_layout)
 
     # Helper: place a popup on the same screen as the root
     def _place_popup(self, popup, width, height, align="center", margin=40):
@@ -143,6 +445,7 @@ class AuditApp:
                 if self._get_missing_fields(current) and idx not in audited_indices:
                     filtered.append((idx, current.copy()))
             self.missing_rows = filtered
+            self.audit_state.missing = {idx for idx, _ in filtered}
         except Exception:
             # Leave as-is if anything goes wrong
             pass
@@ -196,6 +499,12 @@ class AuditApp:
             self.btn_back = tk.Button(self.frame, text="Back", command=self.undo_last)
         self.btn_back.place_forget()
 
+        # View switcher under the product image (placed on the canvas by display_row)
+        self.view_bar = ttk.Frame(self.frame)
+        for view in (1,) + tuple(ALTERNATE_VIEWS):
+            ttk.Button(self.view_bar, text=f"View {view}", width=7,
+                       command=lambda v=view: self.show_view(v)).pack(side=tk.LEFT, padx=2)
+
     def load_csv(self):
         file_path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
         if not file_path:
@@ -303,7 +612,46 @@ class AuditApp:
             # Ensure Name -> Internal ID map exists on resume
             if not getattr(self, "name_to_internal_id", None):
                 self.name_to_internal_id = self._build_name_to_id(self.original_csv_path)
+        self._drop_predecoded()
+        # Images in a bundle next to the report are read from it in place instead of downloaded
+        self._close_bundle()
+        self.image_bundle = image_bundle.open_bundle(image_bundle.bundle_path_for(self.original_csv_path))
         # Start download in a background thread (idempotent; will skip existing images)
+        # A previous report's download run stops handing out jobs
+        for scheduler in (self.preview_scheduler, self.download_scheduler):
+            if scheduler is not None:
+                scheduler.close()
+        self.download_done = False
+        self.download_events = queue.Queue()
+        self.download_completed = 0
+        self.download_manifest = None
+        self.download_results = {}
+        # Fetch in the order show_image visits rows, starting from where this session resumes
+        window = (DISK_WINDOW_HISTORY, DISK_WINDOW_AHEAD) if DISK_WINDOW else None
+        self.download_scheduler = download_helper.DownloadScheduler(DOWNLOAD_LOOKAHEAD, window=window)
+        self.on_disk = {}
+        self.name_to_row = {}
+        for idx, name in enumerate(self.expected_names):
+            self.name_to_row.setdefault(name, idx)
+        self.preview_events = queue.Queue()
+        self.preview_results = {}
+        self.preview_shown = None
+        self.preview_scheduler = download_helper.DownloadScheduler(DOWNLOAD_LOOKAHEAD) if PREVIEW_FIRST and not DISK_WINDOW else None
+        self.preview_rows = None
+        self._set_download_position(self.index)
+        self.download_failures = {}
+        self._rebuild_audit_state()
+        self.late_rows = []
+        self.late_row = None
+        self.download_reconciled = False
+        if self.retry_queue is not None:
+            self.retry_queue.stop()
+        self.retry_queue = download_helper.RetryQueue(
+            self.temp_folder, events=self.download_events, initial_delay=DOWNLOAD_RETRY_DELAY,
+            max_delay=DOWNLOAD_RETRY_MAX_DELAY, cache=self.image_cache, revalidate=IMAGE_CACHE_REVALIDATE,
+            display_size=PRODUCT_IMAGE_SIZE, hedger=self.download_hedger)
+        self.download_limiter = download_helper.AdaptiveLimiter(
+            max_limit=DOWNLOAD_CONCURRENCY, max_rps=MAX_REQUESTS_PER_SECOND) if ADAPTIVE_CONCURRENCY else None
         threading.Thread(
             target=self.download_images_thread,
             args=(parent_csv_for_dl, self.temp_folder),
@@ -314,19 +662,105 @@ class AuditApp:
         self.poll_progress(total_images)
 
     def download_images_thread(self, parent_csv_path, temp_folder):
+        # The preview tier runs alongside, so the rows in front of the auditor get their full-size
+        # images without waiting for every thumbnail in the report
+        if self.preview_scheduler is not None:
+            threading.Thread(target=self._download_previews, args=(parent_csv_path, temp_folder), daemon=True).start()
         try:
-            download_helper.download_images(parent_csv_path, temp_folder, item_col='Name', picture_id_col='Picture ID')
+            self.download_manifest = download_helper.download_images(
+                parent_csv_path, temp_folder, item_col='Name', picture_id_col='Picture ID',
+                engine=DOWNLOAD_ENGINE, concurrency=DOWNLOAD_CONCURRENCY,
+                cache=self.image_cache, revalidate=IMAGE_CACHE_REVALIDATE,
+                events=self.download_events, scheduler=self.download_scheduler,
+                limiter=self.download_limiter, bundle=self.image_bundle, display_size=PRODUCT_IMAGE_SIZE,
+                hedger=self.download_hedger)
+        except Exception as e:
+            print(f"Image download failed: {e}")
         finally:
             # NEW: mark download complete so we can reconcile failures
             self.download_done = True
 
+    def _download_previews(self, parent_csv_path, temp_folder):
+        # Thumbnail pass, only for rows whose full-size image is not already on hand
+        # (session folder, cache or offline bundle); failures here never affect the audit
+        if self.preview_scheduler is None:
+            return
+        rows = pd.read_csv(parent_csv_path, dtype=str)
+        jobs = download_helper._build_jobs(rows, 'Name', 'Picture ID')
+
+        def _on_hand(job):
+            identifier, save_as = job
+            if os.path.exists(os.path.join(temp_folder, f"{save_as}.jpg")):
+                return True
+            if self.image_bundle is not None and identifier in self.image_bundle:
+                return True
+            return self.image_cache is not None and self.image_cache.get_entry(identifier, download_helper.DEFAULT_BASE_URL) is not None
+
+        on_hand = [_on_hand(job) for job in jobs]
+        needed = rows[[not held for held in on_hand]]
+        if needed.empty:
+            return
+        # The preview scheduler counts positions within `needed`, not the report
+        self.preview_rows = [i for i, held in enumerate(on_hand) if not held]
+        self.preview_scheduler.set_position(self._preview_position(self.index))
+        try:
+            download_helper.download_images(
+                needed, os.path.join(temp_folder, "preview"), item_col='Name', picture_id_col='Picture ID',
+                base_url=download_helper.preview_url(download_helper.DEFAULT_BASE_URL, PREVIEW_SIZE),
+                engine=DOWNLOAD_ENGINE, concurrency=DOWNLOAD_CONCURRENCY, cache=self.preview_cache,
+                revalidate=IMAGE_CACHE_REVALIDATE, events=self.preview_events, scheduler=self.preview_scheduler,
+                limiter=self.download_limiter)
+        except Exception as e:
+            print(f"Preview download failed: {e}")
+
+    def _set_download_position(self, index):
+        # Both tiers fetch around the row the auditor is on
+        if self.download_scheduler is not None:
+            self.download_scheduler.set_position(index)
+        if self.preview_scheduler is not None:
+            self.preview_scheduler.set_position(self._preview_position(index))
+        if DISK_WINDOW:
+            self._evict_outside_window(index)
+
+    def _preview_position(self, index):
+        # First preview job at or after report row `index`
+        if self.preview_rows is None:
+            return index
+        return bisect.bisect_left(self.preview_rows, index)
+
+    def _evict_outside_window(self, index):
+        # Delete session files for rows that left the window and hand them back to the scheduler,
+        # so going back to one of them re-fetches it (waiting like any other pending image)
+        lo, hi = index - DISK_WINDOW_HISTORY, index + DISK_WINDOW_AHEAD
+        for name, idx in list(self.on_disk.items()):
+            if lo <= idx < hi:
+                continue
+            img_path = os.path.join(self.temp_folder, f"{name}.jpg")
+            row = self.data.iloc[idx]
+            paths = [img_path, download_helper.display_variant_path(img_path, PRODUCT_IMAGE_SIZE),
+                     os.path.join(self.temp_folder, "preview", f"{name}.jpg")]
+            picture_id = self._picture_id(row)
+            for view in ALTERNATE_VIEWS:
+                paths.append(self._view_path(picture_id, view))
+                self.view_fetches.pop((picture_id, view), None)
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            del self.on_disk[name]
+            self.download_results.pop(name, None)
+            self.variant_jobs.discard(img_path)
+            self.download_scheduler.requeue(idx)
+
     def poll_progress(self, total_images):
         # NEW: use expected count (parents) for progress display
         total_expected = len(self.expected_names) if self.expected_names else total_images
-        downloaded = len([f for f in os.listdir(self.temp_folder) if f.lower().endswith('.jpg') or f.lower().endswith('.png')])
+        self._drain_download_events()
 
-        if not self.download_done:
-            percent = (downloaded / total_expected) * 100 if total_expected else 0
+        # Open the audit view as soon as the first few products in audit order are ready
+        if not self.download_done and not self._first_images_ready():
+            percent = (self.download_completed / total_expected) * 100 if total_expected else 0
             # Keep UI responsive and show progress until thread completes
             self.progress_var.set(min(percent, 99.0))
             self.progress_bar.update_idletasks()
@@ -335,16 +769,6 @@ class AuditApp:
             self.root.after(100, lambda: self.poll_progress(total_images))
             return
 
-        # Download thread finished: reconcile failures (missing files)
-        present_basenames = {os.path.splitext(f)[0] for f in os.listdir(self.temp_folder)
-                             if f.lower().endswith('.jpg') or f.lower().endswith('.png')}
-        expected_set = set(self.expected_names)
-        failed_names = sorted(expected_set - present_basenames)
-
-        # Add failed downloads to "wrong images" and exclude from audit flow
-        if failed_names:
-            self.wrong_image_names.update(failed_names)
-
         # Wrap up progress UI
         self.progress_var.set(100)
         self.progress_bar.update_idletasks()
@@ -359,9 +783,175 @@ class AuditApp:
         self._load_bg_image()
         self._update_bg_image()
 
+        # Keep consuming download events in the background; reconciles once the thread finishes
+        self._pump_downloads()
+        self.show_image()
+
+    def _drain_download_events(self):
+        # Consume DownloadResult events pushed by the download thread
+        while True:
+            try:
+                result = self.download_events.get_nowait()
+            except queue.Empty:
+                break
+            if result.name not in self.download_results:
+                self.download_completed += 1
+            self.download_results[result.name] = result
+            if result.status in download_helper.FILE_STATUSES and result.name in self.name_to_row:
+                self.on_disk[result.name] = self.name_to_row[result.name]
+            if result.ok:
+                if result.name in self.download_failures:
+                    self._download_arrived(result.name)
+            else:
+                self._download_failed(result.name, result)
+        while True:
+            try:
+                result = self.preview_events.get_nowait()
+            except queue.Empty:
+                break
+            self.preview_results[result.name] = result
+
+    def _download_failed(self, name, result):
+        # Sit the row out and keep retrying; it only becomes a bad image if it still fails at finish.
+        # A row the auditor already judged from its preview keeps that decision.
+        if self.audit_state.name_audited(name):
+            return
+        self.download_failures[name] = result
+        self.audit_state.exclude(name, AuditState.FAILED)
+        if self.retry_queue is None:
+            return
+        if result is not None:
+            identifier = result.identifier
+        else:
+            rows = self.data[self.data['Name'].astype(str) == name]
+            picture_id = rows['Picture ID'].iloc[0] if len(rows) and 'Picture ID' in rows else name
+            identifier = picture_id if pd.notna(picture_id) else name
+        self.retry_queue.add(identifier, name)
+
+    def _download_arrived(self, name):
+        # A retried image made it: rows already passed go back into the remaining audit queue
+        del self.download_failures[name]
+        self.audit_state.include(name, AuditState.FAILED)
+        print(f"Image arrived on retry: {name}")
+        for idx in self.data.index[self.data['Name'].astype(str) == name]:
+            if idx < self.index and idx not in self.late_rows:
+                self.late_rows.append(int(idx))
+        self.late_rows.sort()
+
+    def _row_audited(self, idx):
+        return self.audit_state.has_choice(idx)
+
+    def _preview_ready(self, name):
+        result = self.preview_results.get(name)
+        return result is not None and result.ok
+
+    def _first_images_ready(self):
+        upcoming = self.expected_names[self.index:self.index + START_AUDIT_AFTER_READY]
+        return all(name in self.download_results or self._preview_ready(name) for name in upcoming)
+
+    def _pump_downloads(self):
+        self._drain_download_events()
+        self._swap_in_full_image()
+        if self.download_done and not self.download_reconciled:
+            # Download thread finished: reconcile failures from the result manifest
+            self.download_reconciled = True
+            for name in self._failed_downloads():
+                # Failed results are already tracked from their events; this catches names with no result at all
+                if name not in self.download_results:
+                    self._download_failed(name, None)
+        # Keep listening for the rest of the session: background retries report through the same queue
+        if not self.completed and not getattr(self, "_app_quitting", False):
+            self.root.after(100 if not self.download_done else 500, self._pump_downloads)
+
+    def _image_pending(self, name):
+        # The auditor got ahead of the downloads: this row's image has not been resolved yet
+        return not self.download_done and name not in self.download_results and not self._preview_ready(name)
+
+    def _swap_in_full_image(self):
+        # The row on screen shows a preview: redraw it once its full-size image has arrived
+        name = self.preview_shown
+        if name is None or name not in self.download_results:
+            return
+        if not self.download_results[name].ok:
+            self.preview_shown = None  # keep the preview; the full image is not coming
+            return
+        if self.displayed_row is not None and self.current_view == 1 and self._image_wait_id is None:
+            self._draw_product_image(self._open_product_image(self.displayed_row), "Image not found")
+
+    def _wait_for_image(self):
+        # Hold the row (input is ignored) and re-check shortly instead of treating it as a wrong image
+        if self._image_wait_id is None:
+            items = self._row_layout()
+            self.canvas.itemconfig("row", state='hidden')
+            # The Style Number entry and progress counter are placed on the frame, not canvas items
+            self.style_entry.place_forget()
+            self.progress_label.place_forget()
+            self.canvas.itemconfig(items["loading"], state='normal')
+        self._image_wait_id = self.root.after(100, self._resume_after_wait)
+
+    def _resume_after_wait(self):
+        self._image_wait_id = None
         self.show_image()
 
+    def _cancel_image_wait(self):
+        if self._image_wait_id is not None:
+            self.root.after_cancel(self._image_wait_id)
+            self._image_wait_id = None
+
+    def _failed_downloads(self):
+        # Expected names without a usable image according to the download manifest.
+        # Names the manifest does not cover (e.g. the download thread crashed) fall back to a file check.
+        results = {r.name: r for r in (self.download_manifest or [])}
+        failed = set()
+        for name in self.expected_names:
+            result = results.get(name)
+            if result is not None:
+                if not result.ok:
+                    failed.add(name)
+            elif not os.path.exists(os.path.join(self.temp_folder, f"{name}.jpg")):
+                failed.add(name)
+        return sorted(failed)
+
     def show_image(self):
+        self._cancel_image_wait()
+        if self.late_row is not None and self.index != self.late_row:
+            # The late row was just audited: carry on with the next late row (or the end), not by walking forward
+            self.late_row = None
+            self.index = len(self.data)
+        # Skip rows the flow does not show, in a loop (a long run of skipped rows must not recurse)
+        row = None
+        while self.data is not None:
+            if self.index >= len(self.data):
+                # Images that arrived on retry after their row was skipped are audited before anything else
+                if not self.late_rows:
+                    break
+                self.index = self.late_row = self.late_rows.pop(0)
+                continue
+            row = self.data.iloc[self.index]
+            # NEW: skip rows whose image failed to download (removed from audit flow until a retry succeeds)
+            try:
+                name_val = str(row['Name']) if 'Name' in row else ""
+            except Exception:
+                name_val = ""
+            # Revisiting a late row: rows already audited are passed over too
+            if name_val in self.wrong_image_names or name_val in self.download_failures or self._row_audited(self.index):
+                self._skip_row()
+                continue
+            # Use unified missing detection
+            missing_fields = self._get_missing_fields(row)
+            if missing_fields:
+                # Only add if not already in missing_rows AND not already fixed in choices
+                already_fixed = any(
+                    entry[1].name == self.index and entry[0] in ('accepted', 'to_audit', 'wrong_image')
+                    for entry in self.choices
+                )
+                if self.index not in self.audit_state.missing and not already_fixed:
+                    self.missing_rows.append((self.index, row.copy()))
+                    self.audit_state.missing.add(self.index)
+                self._skip_row()
+                continue
+            break
+        self._set_download_position(self.index)
         if self.data is None or self.index >= len(self.data):
             if self.missing_rows:
                 # Use native messagebox so OK button isn't tiny
@@ -381,35 +971,63 @@ class AuditApp:
                 return
             self.finish()
             return
-        row = self.data.iloc[self.index]
 
-        # NEW: skip rows whose image failed to download (removed from audit flow)
-        try:
-            name_val = str(row['Name']) if 'Name' in row else ""
-        except Exception:
-            name_val = ""
-        if name_val in self.wrong_image_names:
-            self.index += 1
-            self.show_image()
-            return
-
-        # Use unified missing detection
-        missing_fields = self._get_missing_fields(row)
-        if missing_fields:
-            # Only add if not already in missing_rows AND not already fixed in choices
-            already_fixed = any(
-                entry[1].name == self.index and entry[0] in ('accepted', 'to_audit', 'wrong_image')
-                for entry in self.choices
-            )
-            if not any(idx == self.index for idx, _ in self.missing_rows) and not already_fixed:
-                self.missing_rows.append((self.index, row.copy()))
-            self.index += 1
-            self.show_image()
+        if self._image_pending(name_val):
+            self._wait_for_image()
             return
 
         self.display_row(row)
         #self.btn_back.place(x=205, y=750)
 
+    def _skip_row(self):
+        # Past a late row everything up to the end was already handled, so go straight to the end
+        self.index = len(self.data) if self.late_row is not None else self.index + 1
+
+    def _row_layout(self):
+        # Canvas items and widgets for a product row, built once; display_row only updates them.
+        # Everything tagged "row" is hidden together while a row waits for its image.
+        if self.row_items is not None:
+            return self.row_items
+        canvas, font = self.canvas, self.canvas_font
+        x = PRODUCT_IMAGE_SIZE[0] + 25
+        items = {}
+
+        def _text(key, y, text=""):
+            items[key] = canvas.create_text(x, y, anchor='nw', text=text, font=font, tags=("row",))
+
+        # Main product image at natural resolution (511x730), with a placeholder text in the same slot
+        self.tk_img = ImageTk.PhotoImage("RGB", PRODUCT_IMAGE_SIZE)
+        items["product"] = canvas.create_image(0, 0, anchor='nw', image=self.tk_img, state='hidden', tags=("row",))
+        items["placeholder"] = canvas.create_text(100, 100, anchor='nw', font=font, tags=("row",))
+        if ALTERNATE_VIEWS:
+            items["views"] = canvas.create_window(5, PRODUCT_IMAGE_SIZE[1] + 5, anchor='nw', window=self.view_bar, tags=("row",))
+        # Back button centered under the product image
+        self.btn_back.config(bg="white", activebackground="white", highlightthickness=0, bd=0)
+        items["back"] = canvas.create_window(PRODUCT_IMAGE_SIZE[0] // 2, PRODUCT_IMAGE_SIZE[1], anchor='n', window=self.btn_back,
+                                             width=100, height=44, tags=("row",))
+        # Info boxes, at least 50px to the right of the product image
+        _text("logo_id", 10)
+        items["logo"] = canvas.create_image(x + 100, 50, anchor='nw', tags=("row",))
+        _text("class_mapping", 260)
+        _text("color_id", 295)
+        items["color"] = canvas.create_image(x + 100, 335, anchor='nw', tags=("row",))
+        _text("team_league", 545)
+        _text("silhouette", 580)
+        _text("web_style", 615)
+        _text("display_name", 650)
+        # The rest moves down a line when the display name wraps
+        _text("marketing_event", 680)
+        _text("style_label", 715, "Style Number:")
+        items["loading"] = canvas.create_text(100, 100, text="Loading image...", anchor='nw', font=font, state='hidden')
+
+        # Style Number (the Name column) as a copyable Entry, with the progress counter to its right
+        self.style_entry = ttk.Entry(self.frame, font=font, width=30)
+        self.style_entry.config(state='readonly')
+        if not self.progress_label or not self.progress_label.winfo_exists():
+            self.progress_label = ttk.Label(self.frame, font=font)
+        self.row_items = items
+        return items
+
     def display_row(self, row):
         logo_id = row['Logo ID'] if pd.notna(row['Logo ID']) else ""
         class_mapping = row['Class Mapping'] if pd.notna(row['Class Mapping']) else ""
@@ -419,73 +1037,32 @@ class AuditApp:
         marketing_event = row['Marketing Event'] if 'Marketing Event' in row and pd.notna(row['Marketing Event']) else ""
         silhouette = row['Silhouette'] if pd.notna(row['Silhouette']) else ""
         web_style = row['Web Style'] if pd.notna(row['Web Style']) else ""
-        img_path = os.path.join(self.temp_folder, f"{row['Name']}.jpg")  # <-- was TEMP_FOLDER
         logo_path = find_image(LOGOS_FOLDER, logo_id)
         color_path = find_image(COLORS_FOLDER, color_id)
 
-        # Remove all items except the background image
-        items = self.canvas.find_all()
-        for item in items:
-            if not hasattr(self, 'bg_image_id') or item != self.bg_image_id:
-                self.canvas.delete(item)
-
-        # Main product image at natural resolution (511x730)
-        img_x, img_y = 0, 0
-        if os.path.exists(img_path):
-            img = Image.open(img_path)
-            img = img.resize((511, 730))  # Ensure natural resolution
-            self.tk_img = ImageTk.PhotoImage(img)
-            self.canvas.create_image(img_x, img_y, anchor='nw', image=self.tk_img)
-        else:
-            self.canvas.create_text(img_x + 100, img_y + 100, text="Image not found", anchor='nw', font=self.canvas_font)
-
-        # Remove any previous button window from the canvas
-        if hasattr(self, 'btn_back_canvas_id'):
-            self.canvas.delete(self.btn_back_canvas_id)
-
-        # Create the button directly on the canvas, matching the image size
-        btn_x = img_x + (511 // 2)  # Center of product image
-        btn_y = img_y + 730
-        self.btn_back.config(bg="white", activebackground="white", highlightthickness=0, bd=0)
-        self.btn_back_canvas_id = self.canvas.create_window(
-            btn_x, btn_y, anchor='n', window=self.btn_back, width=100, height=44
-        )
-
-        # Info boxes, at least 50px to the right of the product image
-        x_offset = 511 + 25
-        y_offset = 10
-        box_height = 70
-
-        # Logo ID
-        self.canvas.create_text(x_offset, y_offset, anchor='nw', text=f"Logo ID: {logo_id}", font=self.canvas_font)
-        if logo_path and os.path.exists(logo_path):
-            logo_img = Image.open(logo_path).resize((200, 200))
-            self.tk_logo = ImageTk.PhotoImage(logo_img)
-            self.canvas.create_image(x_offset+100, y_offset+40, anchor='nw', image=self.tk_logo)
-        y_offset += box_height + 180
-
-        # Class Mapping
-        self.canvas.create_text(x_offset, y_offset, anchor='nw', text=f"Class Mapping: {class_mapping}", font=self.canvas_font)
-        y_offset += 35
-
-        # Parent Color Primary
-        self.canvas.create_text(x_offset, y_offset, anchor='nw', text=f"Parent Color Primary: {color_id}", font=self.canvas_font)
-        if color_path and os.path.exists(color_path):
-            color_img = Image.open(color_path).resize((200, 200))
-            self.tk_color = ImageTk.PhotoImage(color_img)
-            self.canvas.create_image(x_offset+100, y_offset+40, anchor='nw', image=self.tk_color)
-        y_offset += box_height + 180
-        # Team League Data
-        self.canvas.create_text(x_offset, y_offset, anchor='nw', text=f"Team League Data: {team_league}", font=self.canvas_font)
-        y_offset += 35
-
-        # Silhouette Name
-        self.canvas.create_text(x_offset, y_offset, anchor='nw', text=f"Silhouette: {silhouette}", font=self.canvas_font)
-        y_offset += 35
-
-        # Web Style Name
-        self.canvas.create_text(x_offset, y_offset, anchor='nw', text=f"Web Style: {web_style}", font=self.canvas_font)
-        y_offset += 35
+        items = self._row_layout()
+        canvas = self.canvas
+        canvas.itemconfig(items["loading"], state='hidden')
+        canvas.itemconfig("row", state='normal')
+
+        self.displayed_row = row
+        self.current_view = 1
+        name_val = str(row['Name']) if pd.notna(row['Name']) else ""
+        placeholder = "Image loading..." if self._image_pending(name_val) else "Image not found"
+        self._draw_product_image(self._open_product_image(row), placeholder)
+        if ALTERNATE_VIEWS and PREFETCH_ALTERNATE_VIEWS:
+            self._prefetch_views(row)
+
+        canvas.itemconfig(items["logo_id"], text=f"Logo ID: {logo_id}")
+        self.tk_logo = self.thumbnails.get(logo_path, ASSET_THUMBNAIL_SIZE) if logo_path else None
+        canvas.itemconfig(items["logo"], image=self.tk_logo or '')
+        canvas.itemconfig(items["class_mapping"], text=f"Class Mapping: {class_mapping}")
+        canvas.itemconfig(items["color_id"], text=f"Parent Color Primary: {color_id}")
+        self.tk_color = self.thumbnails.get(color_path, ASSET_THUMBNAIL_SIZE) if color_path else None
+        canvas.itemconfig(items["color"], image=self.tk_color or '')
+        canvas.itemconfig(items["team_league"], text=f"Team League Data: {team_league}")
+        canvas.itemconfig(items["silhouette"], text=f"Silhouette: {silhouette}")
+        canvas.itemconfig(items["web_style"], text=f"Web Style: {web_style}")
 
         # Web Display Name (wrap to two lines if > 25 chars)
         def _wrap_two_lines(text, max_chars=25):
@@ -498,56 +1075,258 @@ class AuditApp:
             return text[:cut].rstrip() + "\n" + text[cut:].lstrip()
 
         display_name_wrapped = _wrap_two_lines(display_name, 45)
-        self.canvas.create_text(
-            x_offset,
-            y_offset,
-            anchor='nw',
-            text=f"Web Display Name: {display_name_wrapped}",
-            font=self.canvas_font
-        )
-        y_offset += 60 if "\n" in display_name_wrapped else 30
+        canvas.itemconfig(items["display_name"], text=f"Web Display Name: {display_name_wrapped}")
+        y_offset = 650 + (60 if "\n" in display_name_wrapped else 30)
 
         # Marketing Event (NEW, placed after Web Display Name)
-        self.canvas.create_text(x_offset, y_offset, anchor='nw', text=f"Marketing Event: {marketing_event}", font=self.canvas_font)
+        x_offset = PRODUCT_IMAGE_SIZE[0] + 25
+        canvas.itemconfig(items["marketing_event"], text=f"Marketing Event: {marketing_event}")
+        canvas.coords(items["marketing_event"], x_offset, y_offset)
         y_offset += 35
 
-        # Add Style Number label on canvas
-        self.canvas.create_text(x_offset, y_offset, anchor='nw', text="Style Number:", font=self.canvas_font)
-
-        # Add Style Number (shows Name column value) as a copyable Entry
+        # Style Number label, with the Name value in the copyable entry next to it
+        canvas.coords(items["style_label"], x_offset, y_offset)
         style_number = row['Name'] if pd.notna(row['Name']) else ""
-        if hasattr(self, 'style_entry') and self.style_entry.winfo_exists():
-            self.style_entry.destroy()
-        self.style_entry = ttk.Entry(self.frame, font=self.canvas_font, width=30)
+        self.style_entry.config(state='normal')
+        self.style_entry.delete(0, tk.END)
         self.style_entry.insert(0, style_number)
         self.style_entry.config(state='readonly')
-        # Place the entry box just to the right of the label
         self.style_entry.place(x=x_offset + 200, y=y_offset)
 
         # progress counter to the right of the Style Number entry
-        audited = self._audited_count()
         # NEW: effective total excludes rows with failed downloads or user-marked wrong images
+        if DEBUG_AUDIT_STATE:
+            self._check_audit_state()
+        self.progress_label.config(text=f"Audited: {self.audit_state.audited} / {self.audit_state.effective_total}")
+        # The entry has a fixed character width, so its requested width is known without a layout pass
+        self.progress_label.place(x=(x_offset + 200 + self.style_entry.winfo_reqwidth() + 20), y=y_offset)
+        self._predecode_ahead()
+
+    def _open_product_image(self, row):
+        # Pre-decoded image if the worker got to this row, else decoded here
+        name = str(row['Name']) if pd.notna(row['Name']) else ""
+        prepared = self._take_predecoded(name)
+        img, source = prepared if prepared is not None else self._load_product_image(row)
+        self.preview_shown = name if source == "preview" else None
+        if source != "variant":
+            self._queue_display_variants(row)
+        return img
+
+    def _load_product_image(self, row):
+        # Display-sized copy first, then the session folder, the persistent cache and the offline bundle
+        # (all keyed like download_helper's jobs), then the preview. Returns (decoded image, source) or
+        # (None, None). Touches no Tk or session state, so the pre-decoder runs it off the Tk thread.
+        name = row['Name'] if pd.notna(row['Name']) else ""
+        img_path = os.path.join(self.temp_folder, f"{name}.jpg")
+        variant = download_helper.display_variant_path(img_path, PRODUCT_IMAGE_SIZE)
+        if os.path.exists(variant):
+            return _decode_product_image(variant), "variant"
+        picture_id = row['Picture ID'] if 'Picture ID' in row and pd.notna(row['Picture ID']) else name
+        if not os.path.exists(img_path) and self.image_cache is not None:
+            img_path = self.image_cache.lookup(picture_id, download_helper.DEFAULT_BASE_URL) or img_path
+        if os.path.exists(img_path):
+            return _decode_product_image(img_path), "file"
+        data = self.image_bundle.read(picture_id) if self.image_bundle is not None else None
+        if data:
+            return _decode_product_image(BytesIO(data)), "bundle"
+        preview_path = os.path.join(self.temp_folder, "preview", f"{name}.jpg")
+        if os.path.exists(preview_path):
+            return _decode_product_image(preview_path), "preview"
+        return None, None
+
+    # ---- look-ahead decoding ----
+    def _upcoming_rows(self, count):
+        # The next rows show_image / fix_missing_loop will display, skipping rows they would skip
+        if self.in_missing_loop and self.data_missing is not None:
+            start = self.missing_index + 1
+            return [self.data_missing.iloc[i] for i in range(start, min(start + count, len(self.data_missing)))]
+        rows = []
+        if self.data is None:
+            return rows
+        for idx in range(self.index + 1, min(self.index + 1 + count * 10, len(self.data))):
+            row = self.data.iloc[idx]
+            name = str(row['Name'])
+            if name in self.wrong_image_names or name in self.download_failures:
+                continue
+            if self._row_audited(idx) or self._get_missing_fields(row):
+                continue
+            rows.append(row)
+            if len(rows) == count:
+                break
+        return rows
+
+    def _predecode_ahead(self):
+        if not PREDECODE_AHEAD:
+            return
+        wanted = set()
+        for row in self._upcoming_rows(PREDECODE_AHEAD):
+            name = str(row['Name']) if pd.notna(row['Name']) else ""
+            wanted.add(name)
+            future = self.predecoded.get(name)
+            if future is not None and not (future.done() and (future.exception() is not None or future.result()[0] is None)):
+                continue
+            if self._image_pending(name):
+                continue
+            self.predecoded[name] = self.predecoder.submit(self._predecode_row, row.copy())
+        # Rows that dropped out of the look-ahead (e.g. after Back) are not kept around
+        for name in [n for n in self.predecoded if n not in wanted]:
+            self.predecoded.pop(name).cancel()
+
+    def _predecode_row(self, row):
+        # Runs on the predecoder thread
+        img, source = self._load_product_image(row)
+        for folder, column in ((LOGOS_FOLDER, 'Logo ID'), (COLORS_FOLDER, 'Parent Color Primary')):
+            asset_path = find_image(folder, row[column] if column in row and pd.notna(row[column]) else "")
+            if asset_path:
+                self.thumbnails.prepare(asset_path, ASSET_THUMBNAIL_SIZE)
+        return img, source
+
+    def _take_predecoded(self, name):
+        future = self.predecoded.pop(name, None)
+        if future is None or future.cancel():
+            return None
         try:
-            data_names_iter = self.data['Name'] if 'Name' in self.data.columns else []
-            effective_total = sum(1 for n in data_names_iter if str(n) not in self.wrong_image_names)
-        except Exception:
-            effective_total = len(self.data) if self.data is not None else 0
-        progress_text = f"Audited: {audited} / {effective_total}"
-        if not self.progress_label or not self.progress_label.winfo_exists():
-            self.progress_label = ttk.Label(self.frame, text=progress_text, font=self.canvas_font)
+            img, source = future.result()  # at most the rest of a decode already under way
+        except Exception as e:
+            print(f"Pre-decoding {name} failed: {e}")
+            return None
+        if img is None:
+            return None
+        # A preview decoded before the full-size image arrived is out of date
+        if source == "preview" and name in self.download_results and self.download_results[name].ok:
+            return None
+        return img, source
+
+    def _drop_predecoded(self):
+        for future in self.predecoded.values():
+            future.cancel()
+        self.predecoded = {}
+
+    def _queue_display_variants(self, row):
+        # Missing display copy: make it (and the next row's) off the Tk thread so later visits are plain loads
+        for r in (row, self._next_row()):
+            if r is None:
+                continue
+            name = str(r['Name']) if pd.notna(r['Name']) else ""
+            img_path = os.path.join(self.temp_folder, f"{name}.jpg")
+            if img_path in self.variant_jobs:
+                continue
+            self.variant_jobs.add(img_path)
+            self.variant_maker.submit(self._make_row_variant, r.copy(), img_path)
+
+    def _make_row_variant(self, row, img_path):
+        # Runs on the variant thread. Rows without a session file (cache fallback, offline bundle) get
+        # their display copy from there; with DISK_WINDOW only session files do, so eviction covers them all.
+        source = None
+        if not os.path.exists(img_path):
+            if DISK_WINDOW:
+                return
+            picture_id = row['Picture ID'] if 'Picture ID' in row and pd.notna(row['Picture ID']) else row['Name']
+            if self.image_cache is not None:
+                source = self.image_cache.lookup(picture_id, download_helper.DEFAULT_BASE_URL)
+            if source is None and self.image_bundle is not None:
+                source = self.image_bundle.read(picture_id)
+            if not source:
+                return
+        download_helper.make_display_variant(img_path, PRODUCT_IMAGE_SIZE, source=source)
+
+    def _draw_product_image(self, img, placeholder):
+        # (Re)draws only the product image slot: new pixels go into the same PhotoImage and canvas item
+        items = self._row_layout()
+        if img is not None:
+            if img.size != PRODUCT_IMAGE_SIZE:
+                img = img.resize(PRODUCT_IMAGE_SIZE)  # Ensure natural resolution
+            self.tk_img.paste(img)
+            self.canvas.itemconfig(items["product"], state='normal')
+            self.canvas.itemconfig(items["placeholder"], state='hidden')
+        else:
+            self.canvas.itemconfig(items["product"], state='hidden')
+            self.canvas.itemconfig(items["placeholder"], text=placeholder, state='normal')
+
+    # ---- alternate views ----
+    def _picture_id(self, row):
+        name = row['Name'] if pd.notna(row['Name']) else ""
+        return str(row['Picture ID']) if 'Picture ID' in row and pd.notna(row['Picture ID']) else str(name)
+
+    def _view_path(self, picture_id, view):
+        return os.path.join(self.temp_folder, "views", f"{picture_id}-{view}.jpg")
+
+    def _request_view(self, picture_id, view):
+        # Each view is fetched at most once per session; returns its Future
+        key = (picture_id, view)
+        if key not in self.view_fetches:
+            self.view_fetches[key] = self.view_fetcher.submit(self._fetch_view, picture_id, view)
+        return self.view_fetches[key]
+
+    def _fetch_view(self, picture_id, view):
+        # Runs on the view fetcher thread
+        result = download_helper.fetch_view(picture_id, view, os.path.join(self.temp_folder, "views"),
+                                            cache=self.view_cache, revalidate=IMAGE_CACHE_REVALIDATE)
+        return result
+
+    def _next_row(self):
+        if self.in_missing_loop and self.data_missing is not None:
+            rows, position = self.data_missing, self.missing_index + 1
         else:
-            self.progress_label.config(text=progress_text)
-        # Position to the right of the entry
-        self.frame.update_idletasks()
-        entry_width_px = self.style_entry.winfo_width()
-        self.progress_label.place(x=(x_offset + 200 + entry_width_px + 20), y=y_offset)
+            rows, position = self.data, self.index + 1
+        if rows is None or position >= len(rows):
+            return None
+        return rows.iloc[position]
+
+    def _prefetch_views(self, row):
+        # Only the product on screen and the next one, so the view-1 batch stays as small as before
+        next_row = self._next_row()
+        for r in (row, next_row):
+            if r is None:
+                continue
+            picture_id = self._picture_id(r)
+            if str(r['Name']) in self.wrong_image_names or str(r['Name']) in self.download_failures:
+                continue
+            for view in ALTERNATE_VIEWS:
+                self._request_view(picture_id, view)
+
+    def show_view(self, view):
+        if self.displayed_row is None or self._image_wait_id is not None:
+            return
+        self.current_view = view
+        row = self.displayed_row
+        if view == 1:
+            self._draw_product_image(self._open_product_image(row), "Image not found")
+            return
+        picture_id = self._picture_id(row)
+        path = self._view_path(picture_id, view)
+        if os.path.exists(path):
+            self._draw_product_image(_decode_product_image(path), "")
+            return
+        if self._request_view(picture_id, view).done():
+            self._draw_product_image(None, f"View {view} not available")
+            return
+        self._draw_product_image(None, f"Loading view {view}...")
+        self.root.after(100, lambda: self._poll_view(picture_id, view))
+
+    def _poll_view(self, picture_id, view):
+        # Redraw once the fetch finishes, unless the auditor moved on or switched views meanwhile
+        if self.displayed_row is None or self.current_view != view or self._picture_id(self.displayed_row) != picture_id:
+            return
+        if not self.view_fetches[(picture_id, view)].done():
+            self.root.after(100, lambda: self._poll_view(picture_id, view))
+            return
+        self.show_view(view)
 
     def fix_missing_loop(self):
         if self.missing_index >= len(self.data_missing):
             self.in_missing_loop = False  # exit missing-loop mode
+            if self.late_rows:
+                # Images that arrived during the fix-up pass still need auditing (and their own fix-ups)
+                self.missing_rows = []
+                self.audit_state.missing.clear()
+                self.index = len(self.data)
+                self.show_image()
+                return
             self.finish()
             return
         row = self.data_missing.iloc[self.missing_index]
+        self._set_download_position(row.name)
 
         # Use unified missing detection for preselection
         missing_fields = self._get_missing_fields(row)
@@ -565,6 +1344,8 @@ class AuditApp:
                 self.missing_index -= 1
             # Optional: remove any previous choice for this row to avoid duplicates
             target_idx = self.data_missing.iloc[self.missing_index].name
+            for entry in [c for c in self.choices if getattr(c[1], "name", None) == target_idx]:
+                self.audit_state.unrecord(entry)
             self.choices = [c for c in self.choices if getattr(c[1], "name", None) != target_idx]
             self.fix_missing_loop()
             return
@@ -579,8 +1360,8 @@ class AuditApp:
             except Exception:
                 name_val = ""
             if name_val:
-                self.wrong_image_names.add(name_val)
-            self.choices.append(('wrong_image', row, False))
+                self._mark_wrong_image(name_val)
+            self._add_choice(('wrong_image', row, False))
             self.missing_index += 1
             self.fix_missing_loop()
             return
@@ -593,21 +1374,21 @@ class AuditApp:
         for field, value in wrong_details.items():
             self.data_missing.at[row_idx, field] = str(value)
             self.data.at[row_idx, field] = str(value)
-        self.choices.append(('to_audit', row, False, wrong_fields, wrong_details))
+        self._add_choice(('to_audit', row, False, wrong_fields, wrong_details))
         self.missing_index += 1
         self.fix_missing_loop()
 
     def mark_right(self, event=None):
-        # Prevent advancing if popup is open
-        if getattr(self, "_popup_open", False):
+        # Prevent advancing if popup is open or the current image is still loading
+        if getattr(self, "_popup_open", False) or self._image_wait_id is not None:
             return
-        self.choices.append(('accepted', self.data.iloc[self.index], False))
+        self._add_choice(('accepted', self.data.iloc[self.index], False))
         self.index += 1
         self.show_image()
 
     def mark_wrong(self, event=None):
-        # Prevent multiple popups or input while popup is open
-        if getattr(self, "_popup_open", False):
+        # Prevent multiple popups or input while popup is open or the current image is still loading
+        if getattr(self, "_popup_open", False) or self._image_wait_id is not None:
             return
         self._popup_open = True
         row = self.data.iloc[self.index]
@@ -623,8 +1404,8 @@ class AuditApp:
             except Exception:
                 name_val = ""
             if name_val:
-                self.wrong_image_names.add(name_val)
-            self.choices.append(('wrong_image', row, False))
+                self._mark_wrong_image(name_val)
+            self._add_choice(('wrong_image', row, False))
             self.index += 1
             self.show_image()
             return
@@ -635,7 +1416,7 @@ class AuditApp:
         # Update the row in self.data with corrected values
         for field, value in wrong_details.items():
             self.data.at[row.name, field] = value
-        self.choices.append(('to_audit', row, False, wrong_fields, wrong_details))
+        self._add_choice(('to_audit', row, False, wrong_fields, wrong_details))
         self.index += 1
         self.show_image()
 
@@ -896,9 +1677,8 @@ class AuditApp:
                 if sel:
                     logo_id = filtered_options[sel[0]]
                     img_path = find_image(image_folder, logo_id)
-                    if img_path and os.path.exists(img_path):
-                        img = Image.open(img_path).resize((150, 150))
-                        tk_img = ImageTk.PhotoImage(img)
+                    tk_img = self.thumbnails.get(img_path, SELECTOR_THUMBNAIL_SIZE) if img_path else None
+                    if tk_img is not None:
                         img_cache["img"] = tk_img
                         image_label.config(image=tk_img, text="")
                     else:
@@ -1064,21 +1844,51 @@ class AuditApp:
             status, row, auto_rejected = entry[:3]
             if not auto_rejected:
                 self.choices.pop(i)
+                self.audit_state.unrecord(entry)
                 # If we undid a wrong_image, remove it from the set
                 if status == 'wrong_image':
                     try:
                         name_val = str(row['Name']) if 'Name' in row else ""
                         if name_val in self.wrong_image_names:
                             self.wrong_image_names.remove(name_val)
+                            self.audit_state.include(name_val, AuditState.WRONG_IMAGE)
                     except Exception:
                         pass
                 self.index = row.name
+                self.late_row = None
                 self.missing_rows = [(idx, r) for idx, r in self.missing_rows if idx != self.index]
+                self.audit_state.missing.discard(self.index)
                 self.show_image()
                 return
         # If nothing to undo, do nothing
 
     def finish(self):
+        # Only images that still fail after the session's retries are classed as bad, with the reason.
+        # Take in anything the retry queue delivered since the last pump first.
+        self._drain_download_events()
+        if self.late_rows:
+            # An image arrived at the last moment: audit its row before finishing (missing rows are all done here)
+            self.in_missing_loop = False
+            self.missing_rows = []
+            self.audit_state.missing.clear()
+            self.index = len(self.data)
+            self.show_image()
+            return
+        if self.retry_queue is not None:
+            self.retry_queue.stop()
+        for scheduler in (self.preview_scheduler, self.download_scheduler):
+            if scheduler is not None:
+                scheduler.close()
+        self._flush_caches()
+        self._close_bundle()
+        for name, result in self.download_failures.items():
+            if self.audit_state.name_audited(name):
+                continue  # judged from its preview after the full-size fetch failed
+            self._mark_wrong_image(name)
+            if result is None:
+                self.image_failure_reasons[name] = "Image not downloaded"
+            else:
+                self.image_failure_reasons[name] = f"{result.error}: {result.detail}" if result.detail else str(result.error)
         self.save_outputs()
         # Add date to the filenames in the message
         date_suffix = datetime.datetime.now().strftime("%Y-%m-%d")
@@ -1129,21 +1939,22 @@ class AuditApp:
                 # Parent row id via map, then fallback
                 prow = name_to_parent.get(parent_name)
                 pid = self.name_to_internal_id.get(parent_name, "") or _id_from_series(prow)
-                rows.append({"Internal ID": pid, "Name": parent_name})
+                reason = self.image_failure_reasons.get(parent_name, "")
+                rows.append({"Internal ID": pid, "Name": parent_name, "Image Failure Reason": reason})
 
                 # Children
                 if hasattr(self, 'child_records') and parent_name in getattr(self, 'child_records', {}):
                     for crow in self.child_records[parent_name]:
                         child_name = str(crow.get('Name', '') or '').strip()
                         cid = self.name_to_internal_id.get(child_name, "") or _id_from_series(crow)
-                        rows.append({"Internal ID": cid, "Name": child_name})
+                        rows.append({"Internal ID": cid, "Name": child_name, "Image Failure Reason": reason})
             return rows
 
         if self.data is None or self.data.empty:
             # Still write a wrong_images file (with new policy columns)
             try:
                 wrong_rows = _collect_wrong_rows()
-                wrong_df = pd.DataFrame(wrong_rows if wrong_rows else [], columns=["Internal ID", "Name"])
+                wrong_df = pd.DataFrame(wrong_rows if wrong_rows else [], columns=["Internal ID", "Name", "Image Failure Reason"])
                 wrong_df["Did you make a POL"] = ""
                 wrong_df["Do Not Display in Web Store"] = "Yes"
                 wrong_df["Do Not Display Reason"] = "Bad Image"
@@ -1155,7 +1966,8 @@ class AuditApp:
                     "Did you make a POL",
                     "Do Not Display in Web Store",
                     "Do Not Display Reason",
-                    "Display in Web Store"
+                    "Display in Web Store",
+                    "Image Failure Reason"
                 ])
 
                 wrong_df.to_csv(wrong_images_filename, index=False)
@@ -1207,7 +2019,7 @@ class AuditApp:
         # Write wrong_images (parents + children) with required policy columns
         try:
             wrong_rows = _collect_wrong_rows()
-            wrong_df = pd.DataFrame(wrong_rows, columns=["Internal ID", "Name"])
+            wrong_df = pd.DataFrame(wrong_rows, columns=["Internal ID", "Name", "Image Failure Reason"])
             wrong_df["Did you make a POL"] = ""
             wrong_df["Do Not Display in Web Store"] = "Yes"
             wrong_df["Do Not Display Reason"] = "Bad Image"
@@ -1219,14 +2031,15 @@ class AuditApp:
                 "Did you make a POL",
                 "Do Not Display in Web Store",
                 "Do Not Display Reason",
-                "Display in Web Store"
+                "Display in Web Store",
+                "Image Failure Reason"
             ])
 
             wrong_df.to_csv(wrong_images_filename, index=False)
         except Exception as e:
             print(f"Failed to write {wrong_images_filename}: {e}")
 
-        # Delete the entire TEMP folder
+        # Delete the entire TEMP folder (the image cache lives outside it and is kept)
         if os.path.exists(TEMP_FOLDER):
             try:
                 shutil.rmtree(TEMP_FOLDER)
@@ -1242,10 +2055,28 @@ class AuditApp:
             self.root.destroy()
 
     def _audited_count(self):
-        try:
-            return len({getattr(c[1], "name", None) for c in self.choices if len(c) >= 3 and not c[2]})
-        except Exception:
-            return len([c for c in self.choices if len(c) >= 3 and not c[2]])
+        return self.audit_state.audited
+
+    # ---- audit state (every change to choices, wrong images and failures goes through here) ----
+    def _add_choice(self, entry):
+        self.choices.append(entry)
+        self.audit_state.record(entry)
+
+    def _mark_wrong_image(self, name):
+        self.wrong_image_names.add(name)
+        self.audit_state.exclude(name, AuditState.WRONG_IMAGE)
+
+    def _report_names(self):
+        return [str(n) for n in self.data['Name']] if self.data is not None and 'Name' in self.data.columns else []
+
+    def _rebuild_audit_state(self):
+        # Once per load/resume; everything after is incremental
+        self.audit_state = AuditState(self._report_names(), self.choices, self.wrong_image_names, self.download_failures,
+                                      [idx for idx, _ in (self.missing_rows or [])])
+
+    def _check_audit_state(self):
+        self.audit_state.verify(self._report_names(), self.choices, self.wrong_image_names, self.download_failures,
+                                [idx for idx, _ in (self.missing_rows or [])])
 
     def quit_app(self):
         # Gracefully save and close everything
@@ -1372,6 +2203,32 @@ class AuditApp:
     def handle_app_exit(self):
         if not self.completed:
             self.save_session()
+        self.view_fetcher.shutdown(wait=False, cancel_futures=True)
+        if self.retry_queue is not None:
+            self.retry_queue.stop()
+        for scheduler in (self.preview_scheduler, self.download_scheduler):
+            if scheduler is not None:
+                scheduler.close()
+        self.variant_maker.shutdown(wait=False, cancel_futures=True)
+        self.predecoder.shutdown(wait=False, cancel_futures=True)
+        if self.download_hedger is not None:
+            self.download_hedger.shutdown()
+        self._flush_caches()
+        self._close_bundle()
+        print(f"Thumbnails: {self.thumbnails.summary()}")
+
+    def _close_bundle(self):
+        # Releases the mapping and file handle (on Windows an open bundle cannot be replaced or deleted)
+        if self.image_bundle is not None:
+            self.image_bundle.close()
+            self.image_bundle = None
+
+    def _flush_caches(self):
+        # View fetches and background retries add cache entries after the download run's own flush;
+        # each flush merges index.json under its lock file, so it happens once on the way out
+        for cache in (self.view_cache, self.preview_cache, self.image_cache):
+            if cache is not None:
+                cache.flush()
 
     # Background helpers
     def _load_bg_image(self):
@@ -1380,10 +2237,11 @@ class AuditApp:
                 bg_path = resource_path("background.png")
                 if os.path.exists(bg_path):
                     self.bg_original = Image.open(bg_path)
+                    self.bg_original.load()  # decoded once, not on every resize
             except Exception:
                 self.bg_original = None
 
-    def _update_bg_image(self, width=None, height=None):
+    def _update_bg_image(self, width=None, height=None, resample=Image.LANCZOS):
         if not self.bg_original or not hasattr(self, "canvas"):
             return
         # Determine target size (canvas size)
@@ -1393,23 +2251,59 @@ class AuditApp:
             # Canvas not yet laid out; try again shortly
             self.root.after(50, self._update_bg_image)
             return
+        cached = self.bg_cache.get((w, h))
+        if cached is not None:
+            self.bg_cache.move_to_end((w, h))
+            self._show_bg_image(cached)
+            return
         try:
             # Stretch to fill canvas
-            resized = self.bg_original.resize((w, h), Image.LANCZOS)
-            self.tk_bg_img = ImageTk.PhotoImage(resized)
-            if self.bg_image_id:
-                self.canvas.itemconfig(self.bg_image_id, image=self.tk_bg_img)
-            else:
-                self.bg_image_id = self.canvas.create_image(0, 0, anchor='nw', image=self.tk_bg_img)
-            self.canvas.tag_lower(self.bg_image_id)
+            tk_img = ImageTk.PhotoImage(self.bg_original.resize((w, h), resample))
         except Exception:
-            pass
+            return
+        if resample == Image.LANCZOS:
+            self.bg_cache[(w, h)] = tk_img
+            while len(self.bg_cache) > BG_CACHED_SIZES:
+                self.bg_cache.popitem(last=False)
+        self._show_bg_image(tk_img)
+
+    def _show_bg_image(self, tk_img):
+        self.tk_bg_img = tk_img
+        if self.bg_image_id:
+            self.canvas.itemconfig(self.bg_image_id, image=self.tk_bg_img)
+        else:
+            self.bg_image_id = self.canvas.create_image(0, 0, anchor='nw', image=self.tk_bg_img)
+        self.canvas.tag_lower(self.bg_image_id)
 
     def _on_canvas_resize(self, event):
-        # Keep background stretched to new size
-        self._update_bg_image(event.width, event.height)
+        # Keep background stretched to new size. A burst of <Configure> events (dragging an edge) gets one
+        # fast preview per idle moment and a single LANCZOS pass after it settles; cached sizes show at once.
+        size = (event.width, event.height)
+        self._bg_pending_size = size
+        if self._bg_final_id is not None:
+            self.root.after_cancel(self._bg_final_id)
+            self._bg_final_id = None
+        if size in self.bg_cache:
+            if self._bg_preview_id is not None:
+                self.root.after_cancel(self._bg_preview_id)
+                self._bg_preview_id = None
+            self._update_bg_image(*size)
+            return
+        if self._bg_preview_id is None:
+            self._bg_preview_id = self.root.after_idle(self._bg_preview)
+        self._bg_final_id = self.root.after(BG_RESIZE_DEBOUNCE_MS, self._bg_final)
+
+    def _bg_preview(self):
+        self._bg_preview_id = None
+        self._update_bg_image(*self._bg_pending_size, resample=Image.NEAREST)
+
+    def _bg_final(self):
+        self._bg_final_id = None
+        self._update_bg_image(*self._bg_pending_size)
 
 if __name__ == "__main__":
+    # Required so the image normalization worker processes start correctly in the frozen .exe
+    multiprocessing.freeze_support()
     try:
         root = ThemedTk(theme="arc")
     except Exception:
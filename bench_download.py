@@ -0,0 +1,123 @@
+import argparse
+import http.server
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from io import BytesIO
+
+import pandas as pd
+from PIL import Image
+
+import download_helper
+
+"""
+Compares the download engines in download_helper against a local stand-in for the image CDN.
+The stand-in serves a synthetic JPEG per Picture ID and sleeps `--latency` seconds per request
+to imitate the round trip to media.rallyhouse.com; `--tail-fraction` of requests stall for
+`--tail-latency` seconds instead. `--hedge` repeats each run with hedged requests so the
+p50/p95/p99 network fetch times can be compared.
+
+Usage: python bench_download.py --images 500 --latency 0.05 --tail-fraction 0.02 --tail-latency 2 --hedge
+"""
+
+def _make_jpeg(seed):
+    image = Image.new("RGB", (511, 730), ((seed * 7) % 255, (seed * 13) % 255, (seed * 29) % 255))
+    buf = BytesIO()
+    image.save(buf, "JPEG", quality=85)
+    return buf.getvalue()
+
+def start_stand_in_server(latency, tail_fraction=0.0, tail_latency=0.0):
+    """
+    Starts a threaded HTTP server on localhost. Returns (server, base_url template).
+    """
+    body = _make_jpeg(1)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            delay = tail_latency if tail_fraction and random.random() < tail_fraction else latency
+            if delay:
+                time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the client cancelled (e.g. the losing side of a hedged request)
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/homepage/{{}}-1.jpg?tx=f_auto,c_fit,w_730,h_730"
+    return server, base_url
+
+def run_engine(engine, csv_path, base_url, **kwargs):
+    folder = tempfile.mkdtemp(prefix=f"bench_{engine}_")
+    try:
+        start = time.perf_counter()
+        stats = download_helper.DownloadStats()
+        results = download_helper.download_images(csv_path, folder, base_url=base_url, engine=engine, stats=stats, **kwargs)
+        elapsed = time.perf_counter() - start
+        return elapsed, sum(1 for r in results if r.status == download_helper.STATUS_DOWNLOADED), stats.latency_percentiles()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark download_helper engines against a local image server.")
+    parser.add_argument("--images", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.05, help="artificial per-request latency in seconds")
+    parser.add_argument("--workers", type=int, default=None, help="thread-pool size (default: cpu_count - 1)")
+    parser.add_argument("--concurrency", type=int, default=download_helper.DEFAULT_ASYNC_CONCURRENCY)
+    parser.add_argument("--adaptive", action="store_true", help="use an AdaptiveLimiter capped at --concurrency")
+    parser.add_argument("--max-rps", type=float, default=None, help="requests-per-second ceiling for --adaptive")
+    parser.add_argument("--tail-fraction", type=float, default=0.0, help="fraction of requests that stall")
+    parser.add_argument("--tail-latency", type=float, default=2.0, help="seconds a stalled request takes")
+    parser.add_argument("--hedge", action="store_true", help="also run each engine with hedged requests")
+    args = parser.parse_args()
+
+    server, base_url = start_stand_in_server(args.latency, args.tail_fraction, args.tail_latency)
+    work_dir = tempfile.mkdtemp(prefix="bench_csv_")
+    csv_path = os.path.join(work_dir, "bench.csv")
+    names = [f"BENCH{i:05d}" for i in range(args.images)]
+    pd.DataFrame({"Name": names, "Picture ID": names}).to_csv(csv_path, index=False)
+
+    def limiter():
+        if not args.adaptive:
+            return None
+        return download_helper.AdaptiveLimiter(max_limit=args.concurrency, max_rps=args.max_rps)
+
+    engines = [("threads", {"max_workers": args.workers})]
+    if download_helper.aiohttp is not None:
+        engines.append(("async", {"concurrency": args.concurrency}))
+    else:
+        print("aiohttp is not installed; skipping the async engine")
+    try:
+        rows = []
+        for engine, options in engines:
+            rows.append((engine, run_engine(engine, csv_path, base_url, limiter=limiter(), **options)))
+            if args.hedge:
+                # No mirror here: the duplicate goes to the same stand-in, which is what a second CDN edge connection looks like
+                hedger = download_helper.Hedger()
+                rows.append((f"{engine}+hedge", run_engine(engine, csv_path, base_url, limiter=limiter(), hedger=hedger, **options)))
+                hedger.shutdown()
+    finally:
+        server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"\n{args.images} images, {args.latency * 1000:.0f} ms simulated latency"
+          + (f", {args.tail_fraction:.1%} stalling {args.tail_latency:.1f}s" if args.tail_fraction else ""))
+    for engine, (elapsed, ok, latency) in rows:
+        tail = "  ".join(f"p{p} {seconds * 1000:6.0f} ms" for p, seconds in latency.items())
+        print(f"{engine:>14}: {elapsed:7.2f}s  {ok / elapsed if elapsed else 0:8.1f} images/s  ({ok} downloaded)  {tail}")
+
+if __name__ == "__main__":
+    main()
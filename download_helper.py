@@ -1,60 +1,1640 @@
 from email.mime import base
+import asyncio
+import datetime
+import email.utils
 import os
+import random
+import re
+import tempfile
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 from PIL import Image
 from io import BytesIO
 import concurrent.futures
+import concurrent.futures.process
+from collections import deque, namedtuple
+import image_cache
+try:
+    import aiohttp
+except ImportError:  # async engine is optional
+    aiohttp = None
+
+DEFAULT_BASE_URL = 'https://media.rallyhouse.com/homepage/{}-1.jpg?tx=f_auto,c_fit,w_730,h_730'
+
+# Network tuning: (connect, read) timeouts in seconds and retry/backoff policy
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 20
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+# Status codes worth retrying; anything else (404, 403, ...) is a permanent failure
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+# Responses that mean "slow down": the adaptive limiter honors their Retry-After
+THROTTLE_STATUS = {429, 503}
+# Ask f_auto for JPEG so the bytes can be written straight to disk without a transcode
+REQUEST_HEADERS = {'User-Agent': 'Mozilla/5.0', 'Accept': 'image/jpeg,image/*;q=0.8'}
+CHUNK_SIZE = 64 * 1024
+JPEG_SOI = b"\xff\xd8"
+JPEG_EOI = b"\xff\xd9"
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Cache revalidation policy: "always", "never", or re-check entries older than N hours
+REVALIDATE_ALWAYS = "always"
+REVALIDATE_NEVER = "never"
+DEFAULT_REVALIDATE_HOURS = 24
+# Rows ahead of the auditor's position that are fetched before anything else
+DEFAULT_LOOKAHEAD = 24
+# In-flight request cap for the asyncio engine
+DEFAULT_ASYNC_CONCURRENCY = 64
+# Thumbnail edge length (px) for the quick preview pass, see preview_url
+DEFAULT_PREVIEW_SIZE = 160
+# Rows read per CSV chunk in streaming mode (download_images(chunksize=...))
+DEFAULT_CSV_CHUNK_ROWS = 2000
+
+_thread_local = threading.local()
+
+def get_session(pool_size=2):
+    """
+    Returns this thread's requests.Session, creating it on first use.
+    Each worker keeps its own keep-alive connection(s) to the CDN so we only pay
+    the TCP+TLS handshake once per worker instead of once per image.
+    """
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(REQUEST_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _thread_local.session = session
+    return session
+
+def _parse_retry_after(value):
+    # Retry-After is either delta-seconds or an HTTP date; returns seconds or None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+        return max((when - datetime.datetime.now(when.tzinfo)).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def _retry_delay(attempt, retry_after=None):
+    # Honor a Retry-After header, otherwise exponential backoff with jitter
+    seconds = _parse_retry_after(retry_after)
+    if seconds is not None:
+        return min(seconds, BACKOFF_MAX)
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.0)
+
+class AdaptiveLimiter:
+    """
+    AIMD controller for in-flight requests, shared by all workers of a run.
+    The limit grows by about one request per round of successful responses while latency stays
+    within LATENCY_TOLERANCE of the best observed, and is cut by DECREASE_FACTOR on 429/503,
+    connection errors/timeouts, other 5xx, or rising latency (at most once per round trip).
+    A Retry-After header pauses all new requests until it expires, and `max_rps` is a hard
+    requests-per-second ceiling regardless of the limit.
+    """
+    LATENCY_TOLERANCE = 2.0
+    DECREASE_FACTOR = 0.5
+    THROUGHPUT_WINDOW = 10.0
+    REPORT_INTERVAL = 5.0
+
+    def __init__(self, initial=4, min_limit=1, max_limit=DEFAULT_ASYNC_CONCURRENCY, max_rps=None, report=True):
+        self.min_limit = max(int(min_limit), 1)
+        self.max_limit = max(int(max_limit), self.min_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.max_rps = max_rps
+        self.report = report
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+        self._latency = None
+        self._best_latency = None
+        self._last_decrease = 0.0
+        self._completions = deque()
+        self._started = None
+        self._last_report = time.monotonic()
+
+    def _try_acquire(self):
+        # With the lock held: 0 when a slot was taken, otherwise how long to wait before trying
+        # again (None: until release/abandon frees a slot)
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self._in_flight >= int(self.limit):
+            return None
+        if self.max_rps:
+            if now < self._next_slot:
+                return self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + 1.0 / self.max_rps
+        self._in_flight += 1
+        if self._started is None:
+            self._started = now
+        return 0
+
+    def acquire(self):
+        # Threads sleep until a slot is freed rather than polling for one
+        with self._slot_freed:
+            while (wait := self._try_acquire()) != 0:
+                self._slot_freed.wait(wait)
+
+    async def acquire_async(self):
+        while True:
+            with self._lock:
+                wait = self._try_acquire()
+            if wait == 0:
+                return
+            await asyncio.sleep(0.01 if wait is None else wait)
+
+    def _notify(self):
+        # With the lock held: wake as many waiting threads as there are free slots
+        free = int(self.limit) - self._in_flight
+        if free > 0:
+            self._slot_freed.notify(free)
+
+    def release(self, latency, congested=False, retry_after=None):
+        """
+        Report one finished attempt. `congested` marks throttling or errors (429/503, 5xx, timeouts).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._in_flight = max(self._in_flight - 1, 0)
+            self._completions.append(now)
+            round_trip = max(self._latency or 0.0, 0.5)
+            pause = _parse_retry_after(retry_after)
+            if pause:
+                self._paused_until = max(self._paused_until, now + min(pause, BACKOFF_MAX * 4))
+            if not congested and not pause:
+                self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+                self._best_latency = self._latency if self._best_latency is None else min(self._best_latency, self._latency)
+                if self._latency <= self._best_latency * self.LATENCY_TOLERANCE:
+                    self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                    congested = False
+                else:
+                    congested = True
+            if congested and now - self._last_decrease > round_trip:
+                self.limit = max(self.min_limit, self.limit * self.DECREASE_FACTOR)
+                self._last_decrease = now
+            if self.report and now - self._last_report >= self.REPORT_INTERVAL:
+                self._last_report = now
+                print(f"Limiter: {self._describe(now)}")
+            self._notify()
+
+    def abandon(self):
+        """
+        Frees the slot of an attempt that was cancelled (e.g. the slower side of a hedged request)
+        without reporting it as a latency sample or a congestion signal.
+        """
+        with self._lock:
+            self._in_flight = max(self._in_flight - 1, 0)
+            self._notify()
+
+    def _throughput(self, now):
+        while self._completions and now - self._completions[0] > self.THROUGHPUT_WINDOW:
+            self._completions.popleft()
+        if self._started is None:
+            return 0.0
+        # Floored at a second: the first completions right after start would otherwise read as huge rates
+        span = max(min(self.THROUGHPUT_WINDOW, now - self._started), 1.0)
+        return len(self._completions) / span
+
+    def _describe(self, now):
+        return (f"concurrency {self.limit:.1f} (in flight {self._in_flight}), "
+                f"{self._throughput(now):.1f} req/s, latency {(self._latency or 0) * 1000:.0f} ms")
+
+    def snapshot(self):
+        """
+        Current tuning state: concurrency limit, in-flight requests, observed throughput (req/s
+        over the last THROUGHPUT_WINDOW seconds) and smoothed latency (s).
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "concurrency": self.limit,
+                "in_flight": self._in_flight,
+                "throughput": self._throughput(now),
+                "latency": self._latency,
+                "paused": max(self._paused_until - now, 0.0),
+            }
+
+    def summary(self):
+        with self._lock:
+            return self._describe(time.monotonic())
+
+class AttemptClock:
+    """
+    Network timing of one fetch, kept by fetch_with_retry / _fetch_with_retry_async. `started` is
+    when the current attempt got its limiter slot (None while it waits for one or backs off) and
+    `seconds` the time spent by finished attempts; slot waits and backoff sleeps are not counted.
+    `on_attempt(seconds)` is called for every attempt that got an HTTP answer.
+    """
+    def __init__(self, on_attempt=None):
+        self.on_attempt = on_attempt
+        self.started = None
+        self.first_started = None
+        self.seconds = 0.0
+
+    def start(self):
+        self.started = time.perf_counter()
+        if self.first_started is None:
+            self.first_started = self.started
+
+    def add(self, seconds):
+        self.seconds += seconds
+
+    def stop(self, answered=True):
+        started, self.started = self.started, None
+        if started is None:
+            return
+        seconds = time.perf_counter() - started
+        self.seconds += seconds
+        if answered and self.on_attempt is not None:
+            self.on_attempt(seconds)
+
+def fetch_with_retry(url, session=None, timeout=None, retries=MAX_RETRIES, limiter=None, clock=None, **kwargs):
+    """
+    GET url with bounded exponential-backoff retries.
+    Connection errors, timeouts and RETRYABLE_STATUS responses are retried;
+    other HTTP errors are raised immediately as permanent failures.
+    With an AdaptiveLimiter, every attempt waits for a slot and reports back its outcome.
+    With an AttemptClock, every attempt is timed from the moment it holds its slot.
+    Returns the successful response (caller must close/consume it).
+    """
+    session = session or get_session()
+    timeout = timeout or (CONNECT_TIMEOUT, READ_TIMEOUT)
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        start = time.perf_counter()
+        if clock is not None:
+            clock.start()
+        try:
+            response = session.get(url, timeout=timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if clock is not None:
+                clock.stop(answered=False)
+            if limiter is not None:
+                limiter.release(time.perf_counter() - start, congested=True)
+            if attempt >= retries:
+                raise
+            time.sleep(_retry_delay(attempt))
+            attempt += 1
+            continue
+        if clock is not None:
+            clock.stop()
+        retry_after = response.headers.get('Retry-After')
+        if limiter is not None:
+            limiter.release(time.perf_counter() - start, congested=response.status_code >= 500 or response.status_code == 429,
+                            retry_after=retry_after if response.status_code in THROTTLE_STATUS else None)
+        if response.status_code in RETRYABLE_STATUS and attempt < retries:
+            response.close()
+            time.sleep(_retry_delay(attempt, retry_after))
+            attempt += 1
+            continue
+        response.raise_for_status()
+        return response
 
 def ensure_folder(folder_name):
     os.makedirs(folder_name, exist_ok=True)
 
 def read_csv(csv_file):
+    # Already-loaded DataFrames pass straight through
+    if isinstance(csv_file, pd.DataFrame):
+        return csv_file
     return pd.read_csv(csv_file, dtype=str)
 
-def download_image(identifier, save_as, folder_name, base_url='https://media.rallyhouse.com/homepage/{}-1.jpg?tx=f_auto,c_fit,w_730,h_730'):
-    image_path = os.path.join(folder_name, f"{save_as}.jpg")
-    if os.path.exists(image_path):
-        print(f"Skipped: {image_path} (already exists)")
+def is_complete_image(path):
+    """
+    Cheap integrity check: JPEG must start with SOI and end with EOI, PNG must carry its
+    signature and an IEND chunk. Catches files truncated by a crash or dropped connection.
+    """
+    try:
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            head = f.read(8)
+            f.seek(max(size - 32, 0))
+            tail = f.read()
+    except OSError:
         return False
+    if head.startswith(JPEG_SOI):
+        return tail.rstrip(b"\x00\r\n ").endswith(JPEG_EOI)
+    if head.startswith(PNG_SIGNATURE):
+        return b"IEND" in tail
+    return False
 
-    img_url = base_url.format(identifier)
+def _normalize_file(raw_path, image_path):
+    """
+    CPU stage work: decodes the non-JPEG bytes in raw_path, converts them to RGB and writes an
+    integrity-checked JPEG to image_path atomically. raw_path is always removed.
+    Runs in a NormalizeStage worker process (or inline). Returns (bytes written, seconds spent).
+    """
+    start = time.perf_counter()
+    folder = os.path.dirname(image_path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".", suffix=".part")
     try:
-        response = requests.get(img_url, headers={'User-Agent': 'Mozilla/5.0'}, stream=True)
-        response.raise_for_status()
-        image = Image.open(BytesIO(response.content))
-        if image.mode == "P":
-            image = image.convert("RGB")
-        image.save(image_path)
-        print(f"Downloaded: {image_path}")
+        with os.fdopen(fd, "wb") as f, Image.open(raw_path) as image:
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.save(f, format="JPEG", quality=95)
+        if not is_complete_image(tmp_path):
+            raise ValueError("truncated or corrupt image data")
+        written = os.path.getsize(tmp_path)
+        os.replace(tmp_path, image_path)
+        return written, time.perf_counter() - start
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    finally:
+        try:
+            os.remove(raw_path)
+        except OSError:
+            pass
+
+class NormalizeStage:
+    """
+    CPU stage of the download pipeline. Decoding, mode conversion and JPEG normalization of
+    non-JPEG downloads, and display-sized variants, run in a ProcessPoolExecutor, so Pillow never
+    holds the GIL that the network workers and the Tk thread need. At most `max_pending` images
+    can be queued for the stage; network workers block until a slot frees up. The pool starts on
+    first use, so runs with nothing to convert never spawn processes.
+    """
+    def __init__(self, max_workers=None, max_pending=None):
+        self.max_workers = max_workers or max((os.cpu_count() or 2) - 1, 1)
+        self._slots = threading.BoundedSemaphore(max_pending or self.max_workers * 2)
+        self._lock = threading.Lock()
+        self._executor = None
+        self.images = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def call(self, fn, *args):
+        """
+        Runs fn(*args) in a worker process and blocks until done. fn is a module-level function
+        returning (value, seconds spent); returns value.
+        """
+        start = time.perf_counter()
+        self._slots.acquire()
+        waited = time.perf_counter() - start
+        try:
+            try:
+                value, seconds = self._pool().submit(fn, *args).result()
+            except (concurrent.futures.process.BrokenProcessPool, PermissionError, NotImplementedError) as e:
+                # No usable worker processes here: do the work inline rather than failing the image
+                print(f"Normalize pool unavailable ({e!r}); converting in-thread")
+                value, seconds = fn(*args)
+        finally:
+            self._slots.release()
+        with self._lock:
+            self.images += 1
+            self.busy_seconds += seconds
+            self.wait_seconds += waited
+        return value
+
+    def run(self, raw_path, image_path):
+        """
+        Normalizes raw_path into image_path in a worker process; blocks until done.
+        Returns the number of bytes written.
+        """
+        return self.call(_normalize_file, raw_path, image_path)
+
+    def summary(self):
+        if not self.images:
+            return "no images needed processing"
+        capacity = self.images * self.max_workers / self.busy_seconds if self.busy_seconds else 0
+        return (f"{self.images} images processed in {self.max_workers} processes, capacity {capacity:.1f} images/s, "
+                f"network workers waited {self.wait_seconds:.1f}s for a slot")
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+def display_variant_path(image_path, size):
+    # Display-sized copy of image_path for a (width, height) target; each size gets its own folder
+    width, height = size
+    return os.path.join(os.path.dirname(image_path), f"display_{width}x{height}", os.path.basename(image_path))
+
+def _make_display_variant(image_path, size, source=None):
+    """
+    CPU stage work: writes the display-sized copy of image_path (read from `source` when given)
+    atomically. Returns (variant path, seconds spent).
+    """
+    start = time.perf_counter()
+    variant = display_variant_path(image_path, size)
+    folder = os.path.dirname(variant)
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".", suffix=".part")
+    try:
+        original = BytesIO(source) if isinstance(source, bytes) else source or image_path
+        with os.fdopen(fd, "wb") as f, Image.open(original) as image:
+            image.draft("RGB", tuple(size))  # decode large JPEGs at a reduced scale
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            image.resize(tuple(size), reducing_gap=3.0).save(f, format="JPEG", quality=90)
+        os.replace(tmp_path, variant)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return variant, time.perf_counter() - start
+
+def make_display_variant(image_path, size, normalizer=None, source=None):
+    """
+    Makes sure an up-to-date display-sized variant of image_path exists, generating it in the CPU
+    stage (`normalizer`) when given. Returns its path, or None if image_path is missing or unreadable.
+    `source` stands in for a full-size image_path that lives elsewhere: the path of a cached copy,
+    or the image's bytes (e.g. from an offline bundle, whose variants are never stale).
+    """
+    variant = display_variant_path(image_path, size)
+    if isinstance(source, bytes):
+        if os.path.exists(variant):
+            return variant
+    else:
+        original = source or image_path
+        try:
+            if os.path.getmtime(variant) >= os.path.getmtime(original):
+                return variant
+        except OSError:
+            pass
+        if not os.path.exists(original):
+            return None
+    try:
+        if normalizer is not None:
+            return normalizer.call(_make_display_variant, image_path, size, source)
+        return _make_display_variant(image_path, size, source)[0]
+    except (OSError, ValueError) as e:
+        print(f"Failed to make display copy of {image_path}: {e}")
+        return None
+
+def _store_image(chunks, image_path, normalizer=None):
+    """
+    Writes image bytes from an iterable of chunks to image_path atomically (temp file + rename).
+    JPEG bytes are streamed to disk untouched; anything else (PNG, WebP, palette images, ...)
+    is normalized to an RGB JPEG by the CPU stage (`normalizer`, a NormalizeStage, or inline).
+    Returns the number of bytes written.
+    Raises ValueError if the written file fails is_complete_image.
+    """
+    folder = os.path.dirname(image_path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            chunks = iter(chunks)
+            first = b""
+            for first in chunks:
+                if first:
+                    break
+            f.write(first)
+            for chunk in chunks:
+                f.write(chunk)
+        if not first.startswith(JPEG_SOI):
+            if normalizer is not None:
+                return normalizer.run(tmp_path, image_path)
+            return _normalize_file(tmp_path, image_path)[0]
+        if not is_complete_image(tmp_path):
+            raise ValueError("truncated or corrupt image data")
+        written = os.path.getsize(tmp_path)
+        os.replace(tmp_path, image_path)
+        return written
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def _existing_image_ok(image_path):
+    # Only skip files that pass the integrity check; anything half-written is fetched again
+    if not os.path.exists(image_path):
+        return False
+    if is_complete_image(image_path):
         return True
-    except requests.exceptions.RequestException as e:
-        print(f"Failed to download {save_as}: {e}")
+    print(f"Re-downloading: {image_path} (incomplete file)")
+    try:
+        os.remove(image_path)
+    except OSError:
+        pass
+    return False
+
+# Per-image outcome statuses reported in DownloadResult.status
+STATUS_DOWNLOADED = "downloaded"
+STATUS_CACHED = "cached"
+STATUS_NOT_MODIFIED = "not_modified"
+STATUS_SKIPPED = "skipped"  # already in the session folder
+STATUS_DEDUPLICATED = "deduplicated"  # linked from another row with the same Picture ID
+STATUS_BUNDLED = "bundled"  # read in place from an offline image bundle, nothing written
+STATUS_FAILED = "failed"
+# Outcomes that leave the image as a file in the session folder
+FILE_STATUSES = (STATUS_DOWNLOADED, STATUS_CACHED, STATUS_NOT_MODIFIED, STATUS_SKIPPED, STATUS_DEDUPLICATED)
+
+class DownloadResult(namedtuple("DownloadResult", "name identifier status bytes latency error detail")):
+    """
+    One image's outcome: saved-as name, fetched identifier, status, bytes transferred,
+    latency in seconds, error class (e.g. "HTTP 404", "ConnectTimeout") and error message.
+    """
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        # The image is available in the session folder
+        return self.status != STATUS_FAILED
+
+def _percentile(values, p):
+    # Nearest-rank percentile of a non-empty sequence
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(int(round(p / 100.0 * len(ordered))) - 1, 0))]
+
+class DownloadStats:
+    """
+    Thread-safe counters for one download run (per-status counts, bytes...) plus the network fetch
+    times of the images that went over the network, for p50/p95/p99 reporting.
+    """
+    LATENCY_SAMPLES = 10000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}
+        self.latencies = deque(maxlen=self.LATENCY_SAMPLES)
+
+    def add(self, key, amount=1):
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + amount
+
+    def add_latency(self, seconds):
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def get(self, key):
+        return self.counts.get(key, 0)
+
+    def latency_percentiles(self, percentiles=(50, 95, 99)):
+        """
+        {percentile: seconds} over the recorded network latencies, or {} before any were recorded.
+        """
+        with self._lock:
+            samples = list(self.latencies)
+        return {p: _percentile(samples, p) for p in percentiles} if samples else {}
+
+    def summary(self):
+        parts = [
+            f"{self.get(STATUS_DOWNLOADED)} downloaded",
+            f"{self.get(STATUS_CACHED) + self.get(STATUS_NOT_MODIFIED)} from cache",
+            f"{self.get(STATUS_SKIPPED)} already present",
+            f"{self.get('requests_saved')} requests saved by deduplication",
+            f"{self.get(STATUS_FAILED)} failed",
+        ]
+        if self.get(STATUS_BUNDLED):
+            parts.insert(2, f"{self.get(STATUS_BUNDLED)} from the image bundle")
+        if self.get('cache_link_failures'):
+            parts.append(f"{self.get('cache_link_failures')} cached images could not be linked and were fetched again")
+        if self.get('revalidated'):
+            parts.append(f"{self.get(STATUS_NOT_MODIFIED)}/{self.get('revalidated')} revalidated unchanged "
+                         f"({self.get('bytes_saved') / 1024 / 1024:.1f} MB saved)")
+        latency = self.latency_percentiles()
+        if latency:
+            parts.append("latency " + "/".join(f"p{p} {seconds * 1000:.0f}" for p, seconds in latency.items()) + " ms")
+        return ", ".join(parts)
+
+def _record(result, stats=None, events=None, network=None):
+    # Count the outcome and publish it to any listener (e.g. the GUI's progress queue).
+    # `network` is the image's fetch time on the wire, without slot waits, backoff or local work.
+    if stats is not None:
+        stats.add(result.status)
+        if result.status == STATUS_DOWNLOADED:
+            stats.add("bytes_downloaded", result.bytes)
+        if network is not None and result.status in (STATUS_DOWNLOADED, STATUS_NOT_MODIFIED):
+            stats.add_latency(network)
+    if events is not None:
+        events.put(result)
+    return result
+
+def _error_class(e):
+    status = getattr(getattr(e, "response", None), "status_code", None) or getattr(e, "status", None)
+    if isinstance(status, int):
+        return f"HTTP {status}"
+    return type(e).__name__
+
+def _needs_revalidation(entry, revalidate):
+    """
+    revalidate: "always", "never" (trust the cache) or a number of hours after which
+    a cached image is checked again with a conditional GET.
+    """
+    if revalidate == REVALIDATE_NEVER or revalidate is None:
         return False
+    if revalidate == REVALIDATE_ALWAYS:
+        return True
+    validated_at = float(entry.get("validated_at") or 0)
+    return (time.time() - validated_at) > float(revalidate) * 3600
+
+def _conditional_headers(entry):
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+def _validators(headers):
+    # What we keep next to each cached file for the next conditional GET
+    return {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "content_length": headers.get("Content-Length"),
+        "validated_at": time.time(),
+    }
+
+def _cache_plan(cache, identifier, base_url, revalidate):
+    """
+    Decides how to satisfy one image from the cache.
+    Returns (entry, request_headers): entry is None on a miss; request_headers is None when the
+    cached copy can be used as-is, otherwise the (possibly conditional) headers for the GET.
+    """
+    if cache is None or cache.lookup(identifier, base_url) is None:
+        return None, {}
+    entry = cache.get_entry(identifier, base_url)
+    if not _needs_revalidation(entry, revalidate):
+        return entry, None
+    return entry, _conditional_headers(entry)
+
+def _from_cache(cache, identifier, base_url, image_path):
+    # Cache hit: link the cached file into the session folder instead of fetching
+    if cache is not None and cache.materialize(identifier, base_url, image_path):
+        print(f"Cached: {image_path}")
+        return True
+    return False
+
+def _not_modified(cache, identifier, base_url, entry, image_path, stats=None):
+    # 304: the cached bytes are still current, only the validation time moves
+    print(f"Not modified: {image_path}")
+    cache.update(identifier, base_url, validated_at=time.time())
+    if stats is not None:
+        stats.add("bytes_saved", int(entry.get("content_length") or entry.get("size") or 0))
+    if _from_cache(cache, identifier, base_url, image_path):
+        return STATUS_NOT_MODIFIED, 0, None, None
+    return STATUS_FAILED, 0, "CacheError", "cached file could not be linked"
+
+def _download_target(cache, identifier, base_url, image_path):
+    # With a cache, bytes land in the cache file and are linked into the session folder afterwards
+    if cache is None:
+        return image_path
+    target = cache.path_for(identifier, base_url)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    return target
+
+def _register_download(cache, identifier, base_url, image_path, headers):
+    if cache is not None:
+        cache.add(identifier, base_url, **_validators(headers))
+        cache.materialize(identifier, base_url, image_path)
+
+def _prepare(identifier, image_path, base_url, cache, revalidate, stats):
+    """
+    Resolves an image without the network when possible.
+    Returns (outcome, entry, headers): outcome is a finished (status, bytes, error, detail) tuple
+    or None when a GET (with `headers`) is still needed.
+    """
+    if _existing_image_ok(image_path):
+        print(f"Skipped: {image_path} (already exists)")
+        return (STATUS_SKIPPED, 0, None, None), None, None
+    entry, headers = _cache_plan(cache, identifier, base_url, revalidate)
+    if headers is None:
+        if _from_cache(cache, identifier, base_url, image_path):
+            return (STATUS_CACHED, 0, None, None), entry, None
+        # A fresh entry that could not be linked in: fetch it again like a miss, nothing is revalidated
+        if stats is not None:
+            stats.add("cache_link_failures")
+        return None, None, {}
+    if entry is not None and stats is not None:
+        stats.add("revalidated")
+    return None, entry, headers
+
+def _download_failed(e, save_as, cache, identifier, base_url, entry, image_path):
+    # A stale cached copy beats no image when revalidation cannot reach the CDN
+    if entry is not None and _from_cache(cache, identifier, base_url, image_path):
+        return STATUS_CACHED, 0, None, None
+    print(f"Failed to download {save_as}: {e}")
+    return STATUS_FAILED, 0, _error_class(e), str(e)
+
+def _timed_chunks(chunks, clock):
+    # Body reads count as network time; the disk writes between them do not
+    chunks = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        chunk = next(chunks, None)
+        clock.add(time.perf_counter() - start)
+        if chunk is None:
+            return
+        yield chunk
+
+def _download_image(identifier, save_as, image_path, base_url, session, timeout, retries, cache, revalidate, stats, limiter, normalizer,
+                    hedger, clock):
+    outcome, entry, headers = _prepare(identifier, image_path, base_url, cache, revalidate, stats)
+    if outcome is not None:
+        return outcome
 
-def download_images(csv_file, folder_name, item_col='Name', picture_id_col='Picture ID', max_workers=None, base_url='https://media.rallyhouse.com/homepage/{}-1.jpg?tx=f_auto,c_fit,w_730,h_730'):
+    try:
+        if hedger is not None:
+            response = hedger.fetch(identifier, base_url, timeout=timeout, retries=retries, limiter=limiter,
+                                    stream=True, headers=headers or None, clock=clock)
+        else:
+            response = fetch_with_retry(base_url.format(identifier), session=session, timeout=timeout, retries=retries, limiter=limiter,
+                                        stream=True, headers=headers or None, clock=clock)
+        with response:
+            if response.status_code == 304 and entry is not None:
+                return _not_modified(cache, identifier, base_url, entry, image_path, stats)
+            written = _store_image(_timed_chunks(response.iter_content(CHUNK_SIZE), clock),
+                                   _download_target(cache, identifier, base_url, image_path), normalizer)
+        _register_download(cache, identifier, base_url, image_path, response.headers)
+        print(f"Downloaded: {image_path}")
+        return STATUS_DOWNLOADED, written, None, None
+    except requests.exceptions.RequestException as e:
+        return _download_failed(e, save_as, cache, identifier, base_url, entry, image_path)
+    except (OSError, ValueError) as e:
+        print(f"Failed to save {save_as}: {e}")
+        return STATUS_FAILED, 0, _error_class(e), str(e)
+
+def download_image(identifier, save_as, folder_name, base_url=DEFAULT_BASE_URL, session=None, timeout=None, retries=MAX_RETRIES,
+                   cache=None, revalidate=DEFAULT_REVALIDATE_HOURS, stats=None, events=None, limiter=None, normalizer=None,
+                   display_size=None, hedger=None):
+    """
+    Fetch one image into folder_name/<save_as>.jpg. Returns a DownloadResult, which is also
+    put on `events` (any queue.Queue-like object) when given.
+    With display_size=(width, height), the display-sized variant is made before the result is published.
+    With a Hedger, slow requests are duplicated to its mirrors (the cache stays keyed on base_url).
+    """
+    start = time.perf_counter()
+    clock = AttemptClock()
+    image_path = os.path.join(folder_name, f"{save_as}.jpg")
+    status, size, error, detail = _download_image(identifier, save_as, image_path, base_url, session, timeout, retries,
+                                                  cache, revalidate, stats, limiter, normalizer, hedger, clock)
+    if display_size and status in FILE_STATUSES:
+        make_display_variant(image_path, display_size, normalizer)
+    return _record(DownloadResult(save_as, identifier, status, size, time.perf_counter() - start, error, detail), stats, events,
+                   clock.seconds)
+
+def _link_duplicate(primary, save_as, folder_name, stats=None, events=None, display_size=None, normalizer=None):
+    """
+    Materializes another Name that uses the same Picture ID as `primary` by hardlinking
+    (or copying) its file, and its display variant, so the image is fetched and resized only once.
+    """
+    start = time.perf_counter()
+    image_path = os.path.join(folder_name, f"{save_as}.jpg")
+    if _existing_image_ok(image_path):
+        status, error, detail = STATUS_SKIPPED, None, None
+    elif not primary.ok:
+        status, error, detail = STATUS_FAILED, primary.error, primary.detail
+    elif image_cache.link_or_copy(os.path.join(folder_name, f"{primary.name}.jpg"), image_path):
+        print(f"Deduplicated: {image_path} (same image as {primary.name})")
+        status, error, detail = STATUS_DEDUPLICATED, None, None
+    else:
+        status, error, detail = STATUS_FAILED, "LinkError", f"could not link image from {primary.name}"
+    if display_size and status in FILE_STATUSES:
+        primary_variant = display_variant_path(os.path.join(folder_name, f"{primary.name}.jpg"), display_size)
+        if status == STATUS_DEDUPLICATED and os.path.exists(primary_variant):
+            image_cache.link_or_copy(primary_variant, display_variant_path(image_path, display_size))
+        make_display_variant(image_path, display_size, normalizer)
+    # Only a primary that actually went to the network saved this row a request
+    if status != STATUS_SKIPPED and primary.status in (STATUS_DOWNLOADED, STATUS_NOT_MODIFIED) and stats is not None:
+        stats.add("requests_saved")
+    return _record(DownloadResult(save_as, primary.identifier, status, 0, time.perf_counter() - start, error, detail), stats, events)
+
+def _from_bundle(bundle, group, stats=None, events=None):
+    """
+    Resolves a whole job group from an offline image bundle (image_bundle.ImageBundle) when it
+    holds the group's Picture ID. The image stays in the bundle; readers open it from there.
+    Returns [(row index, DownloadResult), ...] or None when the bundle cannot serve the group.
+    """
+    identifier = group[0][1][0]
+    if bundle is None or not isinstance(identifier, str) or identifier not in bundle:
+        return None
+    return [(i, _record(DownloadResult(save_as, identifier, STATUS_BUNDLED, 0, 0.0, None, None), stats, events))
+            for i, (identifier, save_as) in group]
+
+def preview_url(base_url, size=DEFAULT_PREVIEW_SIZE):
+    # Same image asked from the CDN at thumbnail size (c_fit keeps the aspect ratio)
+    return re.sub(r"w_\d+,h_\d+", f"w_{int(size)},h_{int(size)}", base_url, count=1)
+
+class RetryQueue:
+    """
+    Keeps retrying failed images in the background for as long as a session lasts. Each image
+    waits initial_delay seconds before its first retry, doubling up to max_delay after every
+    further failure. Every attempt's DownloadResult is put on `events`, so an image that finally
+    arrives shows up like any other download. Extra keyword arguments go to download_image.
+    """
+    def __init__(self, folder_name, base_url=DEFAULT_BASE_URL, events=None, initial_delay=15.0, max_delay=600.0,
+                 **download_options):
+        self.folder_name = folder_name
+        self.base_url = base_url
+        self.events = events
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.options = download_options
+        self._cond = threading.Condition()
+        self._due = {}  # save_as -> [due (monotonic; inf while an attempt runs), delay, identifier]
+        self._stopped = False
+        self._thread = None
+
+    def add(self, identifier, save_as):
+        # Ignored for images already queued or being retried
+        with self._cond:
+            if self._stopped or save_as in self._due:
+                return
+            self._due[save_as] = [time.monotonic() + self.initial_delay, self.initial_delay, identifier]
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def pending(self):
+        with self._cond:
+            return sorted(self._due)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    save_as, entry = min(self._due.items(), key=lambda item: item[1][0], default=(None, None))
+                    wait = entry[0] - time.monotonic() if entry is not None else None
+                    if wait is not None and wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                entry[0] = float("inf")
+                delay, identifier = entry[1], entry[2]
+            result = download_image(identifier, save_as, self.folder_name, self.base_url, **self.options)
+            with self._cond:
+                if result.ok:
+                    del self._due[save_as]
+                else:
+                    delay = min(delay * 2, self.max_delay)
+                    self._due[save_as] = [time.monotonic() + delay, delay, identifier]
+            if self.events is not None:
+                self.events.put(result)
+
+def view_url(base_url, view):
+    # URL template for alternate product view `view` (2 = back, 3 = detail, ...) of the same Picture ID
+    return base_url.replace("{}-1.", f"{{}}-{int(view)}.", 1)
+
+def fetch_view(identifier, view, folder_name, base_url=DEFAULT_BASE_URL, cache=None, **kwargs):
+    """
+    Fetches one alternate view on demand into folder_name/<identifier>-<view>.jpg, through `cache`
+    when given. Views are never part of download_images, so batches only fetch view 1.
+    Extra keyword arguments go to download_image. Returns the DownloadResult.
+    """
     ensure_folder(folder_name)
-    dataFile = read_csv(csv_file)
-    if item_col not in dataFile.columns or picture_id_col not in dataFile.columns:
+    return download_image(identifier, f"{identifier}-{view}", folder_name, view_url(base_url, view), cache=cache, **kwargs)
+
+# ---- asyncio engine (optional, needs aiohttp) ----
+async def _fetch_with_retry_async(http, url, retries=MAX_RETRIES, headers=None, limiter=None, clock=None):
+    """
+    Async counterpart of fetch_with_retry. Returns (status, headers, body bytes).
+    """
+    attempt = 0
+    while True:
+        if limiter is not None:
+            await limiter.acquire_async()
+        start = time.perf_counter()
+        if clock is not None:
+            clock.start()
+        released = False
+        try:
+            async with http.get(url, headers=headers) as response:
+                retry_after = response.headers.get('Retry-After')
+                if limiter is not None:
+                    limiter.release(time.perf_counter() - start, congested=response.status >= 500 or response.status == 429,
+                                    retry_after=retry_after if response.status in THROTTLE_STATUS else None)
+                    released = True
+                if response.status not in RETRYABLE_STATUS or attempt >= retries:
+                    response.raise_for_status()
+                    body = await response.read()
+                    if clock is not None:
+                        clock.stop()
+                    return response.status, response.headers, body
+            if clock is not None:
+                clock.stop()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if clock is not None:
+                clock.stop(answered=False)
+            if limiter is not None and not released:
+                limiter.release(time.perf_counter() - start, congested=True)
+            if attempt >= retries:
+                raise
+            retry_after = None
+        except asyncio.CancelledError:
+            if clock is not None:
+                clock.stop(answered=False)
+            if limiter is not None and not released:
+                limiter.abandon()
+            raise
+        await asyncio.sleep(_retry_delay(attempt, retry_after))
+        attempt += 1
+
+def _permanent_error(e):
+    # An authoritative answer (404, 403...) that another mirror would only repeat
+    status = getattr(getattr(e, "response", None), "status_code", None) or getattr(e, "status", None)
+    return isinstance(status, int) and status < 500 and status not in RETRYABLE_STATUS
+
+class Hedger:
+    """
+    Hedged requests and mirror failover for the slow tail of image fetches.
+    `mirrors` are URL templates equivalent to the run's base_url (CDN host variants, a local caching
+    proxy...). When an attempt has been on the wire (holding its limiter slot, if any) for longer than
+    the `percentile` of recent single-attempt latencies, a duplicate goes to the next mirror (or the same URL when there are none); the first success
+    wins and the slower request is cancelled. An attempt that fails outright (after its own retries)
+    fails over to the next mirror straight away; 4xx answers other than RETRYABLE_STATUS are final.
+    One Hedger can be shared by every worker of a run.
+    """
+    HEDGE_POLL = 0.1
+
+    def __init__(self, mirrors=(), percentile=95, min_delay=0.05, initial_delay=1.0, min_samples=20, window=500, max_workers=128):
+        self.mirrors = list(mirrors or ())
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=window)
+        self._executor = None
+        self.counts = {"requests": 0, "hedged": 0, "hedge_wins": 0, "failovers": 0}
+
+    def delay(self):
+        """
+        How long an attempt may take before it is hedged: the configured percentile of recent
+        attempt latencies (initial_delay until min_samples have been seen).
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay
+            return max(_percentile(self._latencies, self.percentile), self.min_delay)
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    def _sample(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def _urls(self, identifier, base_url):
+        return [template.format(identifier) for template in [base_url] + self.mirrors]
+
+    @staticmethod
+    def _attempt_age(clocks):
+        # How long the oldest in-flight attempt has been on the wire; None while none holds a slot
+        now = time.perf_counter()
+        return max((now - started for started in (clock.started for clock in clocks) if started is not None), default=None)
+
+    def _wait_time(self, clocks, hedged):
+        # Re-read the delay at least every HEDGE_POLL seconds, so requests started before enough
+        # latencies were seen still hedge at the learned percentile rather than initial_delay
+        if hedged:
+            return None
+        age = self._attempt_age(clocks)
+        if age is None:
+            return self.HEDGE_POLL
+        return min(max(self.delay() - age, 0.0), self.HEDGE_POLL)
+
+    def _due(self, clocks):
+        age = self._attempt_age(clocks)
+        return age is not None and age >= self.delay()
+
+    def _next_url(self, urls, launched):
+        # Hedges and failovers walk the mirror list; with no mirrors the hedge repeats the URL
+        return urls[launched % len(urls)]
+
+    # ---- thread engine ----
+    def _submit(self, url, kwargs, clocks):
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hedge")
+            executor = self._executor
+        clock = AttemptClock(self._sample)
+        future = executor.submit(fetch_with_retry, url, clock=clock, **kwargs)
+        clocks[future] = clock
+        return future
+
+    @staticmethod
+    def _close_loser(future):
+        if not future.cancelled() and future.exception() is None:
+            future.result().close()
+
+    def _discard(self, futures):
+        # A request already on the wire cannot be interrupted; its response is closed when it returns
+        for future in futures:
+            if not future.cancel():
+                future.add_done_callback(self._close_loser)
+
+    @staticmethod
+    def _report(clock, clocks, first, winner):
+        # The image's network time runs from the first request's slot to the winner's answer
+        if clock is not None:
+            won = clocks[winner]
+            clock.add(won.seconds + max((won.first_started or 0.0) - (clocks[first].first_started or 0.0), 0.0))
+
+    def fetch(self, identifier, base_url, clock=None, **kwargs):
+        """
+        fetch_with_retry for identifier, hedged and failed over across base_url and the mirrors.
+        Keyword arguments go to fetch_with_retry (each attempt uses its worker thread's own session);
+        `clock` (an AttemptClock) receives the network time of the winning response.
+        Returns the winning response; raises the last error when every attempt failed.
+        """
+        kwargs.pop("session", None)
+        urls = self._urls(identifier, base_url)
+        self._count("requests")
+        clocks = {}
+        first = self._submit(urls[0], kwargs, clocks)
+        pending, launched, hedged, error = {first}, 1, False, None
+        while pending:
+            done, pending = concurrent.futures.wait(pending, timeout=self._wait_time([clocks[f] for f in pending], hedged),
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            if not done:
+                if not self._due([clocks[f] for f in pending]):
+                    continue
+                hedged = True
+                self._count("hedged")
+                pending.add(self._submit(self._next_url(urls, launched), kwargs, clocks))
+                launched += 1
+                continue
+            winner = None
+            for future in done:
+                try:
+                    response = future.result()
+                except requests.exceptions.RequestException as e:
+                    error = e
+                    continue
+                if winner is None:
+                    winner = (future, response)
+                else:
+                    response.close()
+            if winner is not None:
+                self._discard(pending)
+                if hedged and winner[0] is not first:
+                    self._count("hedge_wins")
+                self._report(clock, clocks, first, winner[0])
+                return winner[1]
+            if _permanent_error(error):
+                self._discard(pending)
+                raise error
+            if not pending and launched < len(urls):
+                self._count("failovers")
+                pending.add(self._submit(urls[launched], kwargs, clocks))
+                launched += 1
+        raise error
+
+    # ---- async engine ----
+    def _start_async(self, http, url, kwargs, clocks):
+        clock = AttemptClock(self._sample)
+        task = asyncio.ensure_future(_fetch_with_retry_async(http, url, clock=clock, **kwargs))
+        clocks[task] = clock
+        return task
+
+    async def fetch_async(self, http, identifier, base_url, clock=None, **kwargs):
+        """
+        Async counterpart of fetch() over _fetch_with_retry_async; the slower attempt is cancelled outright.
+        Returns (status, headers, body bytes).
+        """
+        urls = self._urls(identifier, base_url)
+        self._count("requests")
+        clocks = {}
+        first = self._start_async(http, urls[0], kwargs, clocks)
+        pending, launched, hedged, error = {first}, 1, False, None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=self._wait_time([clocks[t] for t in pending], hedged),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    if not self._due([clocks[t] for t in pending]):
+                        continue
+                    hedged = True
+                    self._count("hedged")
+                    pending.add(self._start_async(http, self._next_url(urls, launched), kwargs, clocks))
+                    launched += 1
+                    continue
+                winner = None
+                for task in done:
+                    try:
+                        result = task.result()
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        error = e
+                        continue
+                    if winner is None:
+                        winner = (task, result)
+                if winner is not None:
+                    if hedged and winner[0] is not first:
+                        self._count("hedge_wins")
+                    self._report(clock, clocks, first, winner[0])
+                    return winner[1]
+                if _permanent_error(error):
+                    raise error
+                if not pending and launched < len(urls):
+                    self._count("failovers")
+                    pending.add(self._start_async(http, urls[launched], kwargs, clocks))
+                    launched += 1
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def summary(self):
+        with self._lock:
+            counts = dict(self.counts)
+        return (f"{counts['hedged']}/{counts['requests']} requests hedged ({counts['hedge_wins']} won by the duplicate), "
+                f"{counts['failovers']} mirror failovers, hedge delay {self.delay() * 1000:.0f} ms")
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+async def _download_image_async(http, semaphore, identifier, save_as, image_path, base_url, retries, cache, revalidate, stats, limiter,
+                                normalizer, hedger, clock):
+    # Integrity checks, cache links and index updates touch the disk, so they run in the default
+    # executor; a cache-hit-heavy run would otherwise stall every coroutine on the loop
+    loop = asyncio.get_running_loop()
+    outcome, entry, headers = await loop.run_in_executor(None, _prepare, identifier, image_path, base_url, cache, revalidate, stats)
+    if outcome is not None:
+        return outcome
+
+    async with semaphore:
+        try:
+            if hedger is not None:
+                status, response_headers, content = await hedger.fetch_async(http, identifier, base_url, retries=retries,
+                                                                             headers=headers or None, limiter=limiter, clock=clock)
+            else:
+                status, response_headers, content = await _fetch_with_retry_async(http, base_url.format(identifier), retries=retries,
+                                                                                  headers=headers or None, limiter=limiter, clock=clock)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return await loop.run_in_executor(None, _download_failed, e, save_as, cache, identifier, base_url, entry, image_path)
+    if status == 304 and entry is not None:
+        return await loop.run_in_executor(None, _not_modified, cache, identifier, base_url, entry, image_path, stats)
+    try:
+        written = await loop.run_in_executor(None, _store_download, cache, identifier, base_url, image_path, content, response_headers,
+                                             normalizer)
+    except (OSError, ValueError) as e:
+        print(f"Failed to save {save_as}: {e}")
+        return STATUS_FAILED, 0, _error_class(e), str(e)
+    print(f"Downloaded: {image_path}")
+    return STATUS_DOWNLOADED, written, None, None
+
+def _store_download(cache, identifier, base_url, image_path, content, headers, normalizer):
+    # Executor side of the async engine's save: write the body, then register and link it
+    written = _store_image([content], _download_target(cache, identifier, base_url, image_path), normalizer)
+    _register_download(cache, identifier, base_url, image_path, headers)
+    return written
+
+async def download_image_async(http, semaphore, identifier, save_as, folder_name, base_url=DEFAULT_BASE_URL, retries=MAX_RETRIES,
+                               cache=None, revalidate=DEFAULT_REVALIDATE_HOURS, stats=None, events=None, limiter=None,
+                               normalizer=None, display_size=None, hedger=None):
+    """
+    Same contract as download_image but runs on the event loop.
+    Writing (and any non-JPEG transcode or display variant) is pushed to the default executor so it does not stall other fetches.
+    """
+    start = time.perf_counter()
+    clock = AttemptClock()
+    image_path = os.path.join(folder_name, f"{save_as}.jpg")
+    status, size, error, detail = await _download_image_async(http, semaphore, identifier, save_as, image_path, base_url, retries,
+                                                              cache, revalidate, stats, limiter, normalizer, hedger, clock)
+    if display_size and status in FILE_STATUSES:
+        await asyncio.get_running_loop().run_in_executor(None, make_display_variant, image_path, display_size, normalizer)
+    return _record(DownloadResult(save_as, identifier, status, size, time.perf_counter() - start, error, detail), stats, events,
+                   clock.seconds)
+
+async def _download_jobs_async(scheduler, manifest, folder_name, base_url, concurrency, unexpected, bundle, **kwargs):
+    timeout = aiohttp.ClientTimeout(sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=REQUEST_HEADERS) as http:
+        async def worker():
+            while (group := scheduler.next_job()) is not None:
+                if not group:
+                    await asyncio.sleep(0.1)
+                    continue
+                bundled = _from_bundle(bundle, group, kwargs.get("stats"), kwargs.get("events"))
+                if bundled is not None:
+                    for j, result in bundled:
+                        manifest[j] = result
+                    continue
+                i, job = group[0]
+                try:
+                    primary = await download_image_async(http, semaphore, job[0], job[1], folder_name, base_url, **kwargs)
+                except Exception as e:
+                    primary = unexpected(job, e)
+                manifest[i] = primary
+                for j, (_, save_as) in group[1:]:
+                    manifest[j] = await asyncio.get_running_loop().run_in_executor(
+                        None, _link_duplicate, primary, save_as, folder_name, kwargs.get("stats"), kwargs.get("events"),
+                        kwargs.get("display_size"), kwargs.get("normalizer"))
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+class DownloadScheduler:
+    """
+    Hands jobs to download workers in audit order.
+    Jobs inside the look-ahead window [position, position + lookahead) always go first, so when
+    the auditor moves (set_position) the images they are about to see are fetched next;
+    everything else follows in order from where auditing started.
+    Rows sharing a Picture ID are handed out together as one group, so each image is fetched once.
+
+    With window=(history, ahead) only rows in [position - history, position + ahead) are handed
+    out, which bounds how many images a session keeps on disk. Workers then get an empty group
+    while nothing in the window is left and keep polling until close(); requeue() puts evicted
+    rows back so they are fetched again when the window returns to them.
+    """
+    def __init__(self, lookahead=DEFAULT_LOOKAHEAD, window=None):
+        self.lookahead = max(int(lookahead), 1)
+        self.window = window
+        self._closed = False
+        self._lock = threading.Lock()
+        self._jobs = []
+        self._taken = []
+        self._order = []
+        self._cursor = 0
+        self._position = 0
+        self._groups = {}  # identifier -> row indices sharing it
+
+    def load(self, jobs):
+        with self._lock:
+            self._jobs = list(jobs)
+            self._taken = [False] * len(self._jobs)
+            start = min(self._position, len(self._jobs))
+            self._order = list(range(start, len(self._jobs))) + list(range(0, start))
+            self._cursor = 0
+            self._groups = {}
+            for i, (identifier, _) in enumerate(self._jobs):
+                if isinstance(identifier, str) and identifier:
+                    self._groups.setdefault(identifier, []).append(i)
+
+    def set_position(self, index):
+        with self._lock:
+            self._position = max(int(index), 0)
+
+    def requeue(self, index):
+        # Hand the row out again (e.g. its file was evicted)
+        with self._lock:
+            if 0 <= index < len(self._taken):
+                self._taken[index] = False
+
+    def close(self):
+        # No more jobs: workers stop after their current one
+        with self._lock:
+            self._closed = True
+
+    def _take(self, i):
+        # The requested row first, then every other row that needs the same image
+        identifier = self._jobs[i][0]
+        group = [i] + [j for j in self._groups.get(identifier, ()) if j != i and not self._taken[j]]
+        for j in group:
+            self._taken[j] = True
+        return [(j, self._jobs[j]) for j in group]
+
+    def next_job(self):
+        """
+        Returns the next group to fetch as a list of (row index, (identifier, save_as)) whose first
+        entry is the row to download and the rest are duplicates of it, or None when all are handed out.
+        In window mode an empty list means "nothing to do right now, ask again shortly".
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            end = min(self._position + self.lookahead, len(self._jobs))
+            for i in range(self._position, end):
+                if not self._taken[i]:
+                    return self._take(i)
+            if self.window is not None:
+                history, ahead = self.window
+                for i in range(max(self._position - history, 0), min(self._position + ahead, len(self._jobs))):
+                    if not self._taken[i]:
+                        return self._take(i)
+                return []
+            while self._cursor < len(self._order):
+                i = self._order[self._cursor]
+                self._cursor += 1
+                if not self._taken[i]:
+                    return self._take(i)
+            return None
+
+def _build_jobs(dataFile, item_col, picture_id_col):
+    # (identifier to fetch, file name to save as) per row
+    jobs = []
+    for name, picture_id in zip(dataFile[item_col], dataFile[picture_id_col]):
+        if name == picture_id:
+            jobs.append((name, name))
+        else:
+            jobs.append((picture_id, name))
+    return jobs
+
+def _check_columns(csv_file, item_col, picture_id_col):
+    # Reads only the header row of a CSV path
+    columns = csv_file.columns if isinstance(csv_file, pd.DataFrame) else pd.read_csv(csv_file, dtype=str, nrows=0).columns
+    if item_col not in columns or picture_id_col not in columns:
         raise ValueError(f"'{item_col}' or '{picture_id_col}' column not found in the CSV file.")
-    if max_workers is None:
-        cpu_count = os.cpu_count() or 2
-        max_workers = max(cpu_count - 1, 1)
-    tasks = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        for _, row in dataFile.iterrows():
-            name = row[item_col]
-            picture_id = row[picture_id_col]
-            if name == picture_id:
-                tasks.append(executor.submit(download_image, name, name, folder_name, base_url))
+
+def _read_chunks(csv_file, item_col, picture_id_col, chunksize):
+    # Only the two columns the download needs, `chunksize` rows at a time
+    if isinstance(csv_file, pd.DataFrame):
+        for start in range(0, len(csv_file), chunksize):
+            yield csv_file[[item_col, picture_id_col]].iloc[start:start + chunksize]
+        return
+    yield from pd.read_csv(csv_file, dtype=str, usecols=[item_col, picture_id_col], chunksize=chunksize)
+
+def _stream_groups(csv_file, item_col, picture_id_col, chunksize):
+    """
+    Yields job groups in the DownloadScheduler.next_job format, one CSV chunk at a time.
+    Rows sharing a Picture ID are grouped within a chunk; repeats in later chunks are
+    fetched again (or linked from the cache, when there is one).
+    """
+    row = 0
+    for chunk in _read_chunks(csv_file, item_col, picture_id_col, chunksize):
+        groups = []
+        by_identifier = {}
+        for job in _build_jobs(chunk, item_col, picture_id_col):
+            identifier = job[0]
+            if isinstance(identifier, str) and identifier in by_identifier:
+                by_identifier[identifier].append((row, job))
             else:
-                tasks.append(executor.submit(download_image, picture_id, name, folder_name, base_url))
-        concurrent.futures.wait(tasks)
-    print(f'Download Complete')
+                groups.append([(row, job)])
+                if isinstance(identifier, str) and identifier:
+                    by_identifier[identifier] = groups[-1]
+            row += 1
+        yield from groups
+
+class _ChunkFeed:
+    """
+    Scheduler stand-in for streaming mode. Workers pull groups straight from the chunk reader,
+    so at most one chunk of rows is buffered and the next one is read only when it runs dry.
+    """
+    def __init__(self, groups):
+        self._groups = groups
+        self._lock = threading.Lock()
+
+    def next_job(self):
+        with self._lock:
+            return next(self._groups, None)
+
+class _FailureLog:
+    # Streaming-mode manifest: only failed results are kept, so memory does not grow with the CSV
+    def __init__(self):
+        self.results = []
+
+    def __setitem__(self, row, result):
+        if not result.ok:
+            self.results.append(result)
+
+def download_images(csv_file, folder_name, item_col='Name', picture_id_col='Picture ID', max_workers=None, base_url=DEFAULT_BASE_URL,
+                    engine="threads", concurrency=DEFAULT_ASYNC_CONCURRENCY, cache=None, revalidate=DEFAULT_REVALIDATE_HOURS, stats=None,
+                    events=None, scheduler=None, limiter=None, normalizer=None, chunksize=None, bundle=None,
+                    display_size=None, mirrors=None, hedger=None):
+    """
+    Download every row's image (csv_file is a path or an already-loaded DataFrame) into folder_name.
+    With an image_cache.ImageCache, images already cached are linked in without a request and
+    new downloads are stored in the cache first. `revalidate` ("always", "never" or hours) controls
+    when cached images are re-checked with a conditional GET (see _needs_revalidation).
+    engine="threads" uses a ThreadPoolExecutor of max_workers;
+    engine="async" runs up to `concurrency` requests in flight on a single event loop thread (requires aiohttp).
+    Workers pull jobs from `scheduler` (a DownloadScheduler; rows are fetched in CSV order by default),
+    so a caller can steer fetching toward the rows it needs next.
+    With an AdaptiveLimiter, in-flight requests follow its AIMD limit (workers are sized to its
+    max_limit) and its requests-per-second ceiling.
+    Non-JPEG downloads are converted by `normalizer` (a NormalizeStage; one is created for the run
+    when None, pass False to convert inline in the network worker).
+    With display_size=(width, height), every row with a file also gets a display-sized variant
+    (see display_variant_path) made in the same CPU stage before its result is published.
+    Rows whose Picture ID is in `bundle` (an image_bundle.ImageBundle built for an offline station)
+    are reported as "bundled" without a request or a file in folder_name; read them from the bundle.
+    `mirrors` is a list of URL templates equivalent to base_url: requests slower than the recent p95
+    are hedged to them and failed requests fail over to them (pass a Hedger instead to tune or share it).
+    Every finished image is put on `events` (a queue.Queue) as a DownloadResult as soon as it completes.
+    Returns the result manifest: one DownloadResult per row, in CSV order.
+
+    Streaming mode (chunksize=N, for very large reports): only the two needed columns are read,
+    N rows at a time, and workers pull from the current chunk, so memory stays flat regardless of
+    row count. Picture IDs are deduplicated within a chunk, `scheduler` is not supported, and the
+    returned list holds only the failed results (follow `events` or `stats` for the rest).
+    """
+    ensure_folder(folder_name)
+    _check_columns(csv_file, item_col, picture_id_col)
+    if chunksize:
+        if scheduler is not None:
+            raise ValueError("a scheduler needs every row up front and cannot be used with chunksize")
+        scheduler = _ChunkFeed(_stream_groups(csv_file, item_col, picture_id_col, int(chunksize)))
+        manifest = _FailureLog()
+        row_count = None
+    else:
+        jobs = _build_jobs(read_csv(csv_file), item_col, picture_id_col)
+        scheduler = scheduler if scheduler is not None else DownloadScheduler()
+        scheduler.load(jobs)
+        manifest = [None] * len(jobs)
+        row_count = len(jobs)
+    stats = stats if stats is not None else DownloadStats()
+    own_normalizer = normalizer is None
+    if own_normalizer:
+        normalizer = NormalizeStage()
+    own_hedger = hedger is None and bool(mirrors)
+    if own_hedger:
+        hedger = Hedger(mirrors)
+    options = {"cache": cache, "revalidate": revalidate, "stats": stats, "events": events, "limiter": limiter,
+               "normalizer": normalizer or None, "display_size": display_size, "hedger": hedger}
+
+    def _unexpected(job, e):
+        # Anything a worker did not handle still yields a failed result instead of a missing one
+        identifier, save_as = job
+        print(f"Failed to download {save_as}: {e!r}")
+        return _record(DownloadResult(save_as, identifier, STATUS_FAILED, 0, 0.0, _error_class(e), str(e)), stats, events)
+
+    def _worker():
+        while (group := scheduler.next_job()) is not None:
+            if not group:
+                time.sleep(0.1)
+                continue
+            bundled = _from_bundle(bundle, group, stats, events)
+            if bundled is not None:
+                for j, result in bundled:
+                    manifest[j] = result
+                continue
+            i, job = group[0]
+            try:
+                primary = download_image(job[0], job[1], folder_name, base_url, **options)
+            except Exception as e:
+                primary = _unexpected(job, e)
+            manifest[i] = primary
+            for j, (_, save_as) in group[1:]:
+                manifest[j] = _link_duplicate(primary, save_as, folder_name, stats, events, display_size, options["normalizer"])
+
+    if engine == "async" and aiohttp is None:
+        print("aiohttp is not installed; falling back to the thread-pool engine")
+        engine = "threads"
+    run_start = time.perf_counter()
+    try:
+        if engine == "async":
+            if limiter is not None:
+                concurrency = limiter.max_limit
+            asyncio.run(_download_jobs_async(scheduler, manifest, folder_name, base_url, max(int(concurrency), 1), _unexpected, bundle,
+                                             **options))
+        else:
+            if limiter is not None and max_workers is None:
+                max_workers = limiter.max_limit
+            if max_workers is None:
+                cpu_count = os.cpu_count() or 2
+                max_workers = max(cpu_count - 1, 1)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                worker_count = max_workers if row_count is None else min(max_workers, row_count)
+                workers = [executor.submit(_worker) for _ in range(worker_count)]
+                concurrent.futures.wait(workers)
+        print(f'Download Complete: {stats.summary()}')
+        if limiter is not None:
+            print(f"Limiter: {limiter.summary()}")
+        if hedger is not None:
+            print(f"Hedging: {hedger.summary()}")
+        elapsed = time.perf_counter() - run_start
+        if elapsed > 0:
+            print(f"Network stage: {stats.get(STATUS_DOWNLOADED) / elapsed:.1f} images/s, "
+                  f"{stats.get('bytes_downloaded') / 1024 / 1024 / elapsed:.2f} MB/s")
+        if normalizer:
+            print(f"CPU stage: {normalizer.summary()}")
+        return manifest.results if chunksize else manifest
+    finally:
+        if own_normalizer:
+            normalizer.shutdown()
+        if own_hedger:
+            hedger.shutdown()
+        if cache is not None:
+            cache.flush()
+
+# ---- headless prefetch (command line) ----
+def _parent_rows(dataFile, item_col='Name'):
+    # Same rule as AuditApp.load_csv: child rows ("PARENT : size") are not audited separately
+    names = dataFile[item_col].astype(str)
+    return dataFile[~names.str.contains(" :", regex=False)]
+
+def prefetch_reports(csv_files, cache, item_col='Name', picture_id_col='Picture ID', base_url=DEFAULT_BASE_URL,
+                     engine="threads", concurrency=DEFAULT_ASYNC_CONCURRENCY, revalidate=DEFAULT_REVALIDATE_HOURS,
+                     max_rps=None, mirrors=None):
+    """
+    Warms `cache` with the parent-row images of several reports in one parallel run, so the GUI
+    later links them from the cache instead of downloading. Picture IDs shared between reports
+    are fetched once. Returns the run's DownloadStats.
+    """
+    frames = []
+    for n, csv_file in enumerate(csv_files):
+        try:
+            dataFile = read_csv(csv_file)
+        except (OSError, ValueError) as e:
+            print(f"Skipping {csv_file}: {e}")
+            continue
+        if item_col not in dataFile.columns or picture_id_col not in dataFile.columns:
+            print(f"Skipping {csv_file}: '{item_col}' or '{picture_id_col}' column not found")
+            continue
+        parents = _parent_rows(dataFile, item_col)[[item_col, picture_id_col]].copy()
+        # Prefix names per report so equal Names from different reports cannot collide
+        parents[item_col] = f"{n}_" + parents[item_col].astype(str)
+        frames.append(parents)
+    stats = DownloadStats()
+    if not frames:
+        return stats
+
+    limiter = AdaptiveLimiter(max_limit=concurrency, max_rps=max_rps)
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="prefetch_") as scratch:
+        download_images(pd.concat(frames, ignore_index=True), scratch, item_col=item_col, picture_id_col=picture_id_col,
+                        base_url=base_url, engine=engine, concurrency=concurrency, cache=cache, revalidate=revalidate,
+                        stats=stats, limiter=limiter, mirrors=mirrors)
+    elapsed = time.perf_counter() - start
+    total = sum(stats.get(status) for status in (STATUS_DOWNLOADED, STATUS_CACHED, STATUS_NOT_MODIFIED,
+                                                  STATUS_SKIPPED, STATUS_DEDUPLICATED, STATUS_FAILED))
+    megabytes = stats.get("bytes_downloaded") / 1024 / 1024
+    print(f"Prefetched {total} images from {len(frames)} report(s) in {elapsed:.1f}s: "
+          f"{total / elapsed if elapsed else 0:.1f} images/s, {megabytes / elapsed if elapsed else 0:.2f} MB/s "
+          f"({megabytes:.1f} MB), {stats.get(STATUS_FAILED)} failures")
+    return stats
+
+def watch_folder(folder, cache, interval=30, **kwargs):
+    """
+    Polls `folder` for new or modified CSV reports and prefetches each batch. Runs until interrupted.
+    """
+    seen = {}
+    print(f"Watching {folder} for reports (Ctrl+C to stop)")
+    while True:
+        batch = []
+        try:
+            entries = list(os.scandir(folder))
+        except OSError as e:
+            print(f"Cannot read {folder}: {e}")
+            entries = []
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(".csv"):
+                mtime = entry.stat().st_mtime
+                if seen.get(entry.path) != mtime:
+                    seen[entry.path] = mtime
+                    batch.append(entry.path)
+        if batch:
+            prefetch_reports(sorted(batch), cache, **kwargs)
+        time.sleep(interval)
+
+def _revalidate_arg(value):
+    if value in (REVALIDATE_ALWAYS, REVALIDATE_NEVER):
+        return value
+    return float(value)
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Prefetch report images into the audit tool's image cache.")
+    parser.add_argument("csv_files", nargs="*", help="report CSVs to prefetch")
+    parser.add_argument("--watch", metavar="FOLDER", help="keep watching a drop folder for new reports")
+    parser.add_argument("--interval", type=float, default=30, help="watch polling interval in seconds")
+    parser.add_argument("--cache-dir", default=image_cache.DEFAULT_CACHE_FOLDER, help="image cache folder used by auditorv2.py")
+    parser.add_argument("--cache-max-gb", type=float, default=image_cache.DEFAULT_MAX_BYTES / 1024 ** 3)
+    parser.add_argument("--engine", choices=("threads", "async"), default="async" if aiohttp is not None else "threads")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_ASYNC_CONCURRENCY, help="maximum requests in flight")
+    parser.add_argument("--max-rps", type=float, default=None, help="hard requests-per-second ceiling")
+    parser.add_argument("--revalidate", type=_revalidate_arg, default=DEFAULT_REVALIDATE_HOURS,
+                        help='"always", "never" or hours after which cached images are re-checked')
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument("--mirror", action="append", default=[], metavar="URL",
+                        help="equivalent URL template to hedge slow requests to (repeatable)")
+    args = parser.parse_args(argv)
+    if not args.csv_files and not args.watch:
+        parser.error("give at least one CSV or --watch FOLDER")
+
+    cache = image_cache.ImageCache(args.cache_dir, int(args.cache_max_gb * 1024 ** 3))
+    options = {"base_url": args.base_url, "engine": args.engine, "concurrency": args.concurrency,
+               "revalidate": args.revalidate, "max_rps": args.max_rps, "mirrors": args.mirror}
+    if args.csv_files:
+        stats = prefetch_reports(args.csv_files, cache, **options)
+        if not args.watch:
+            return 1 if stats.get(STATUS_FAILED) else 0
+    try:
+        watch_folder(args.watch, cache, interval=args.interval, **options)
+    except KeyboardInterrupt:
+        pass
+    return 0
 
 if __name__ == "__main__":
-    URL = 'https://media.rallyhouse.com/homepage/{}-1.jpg?tx=f_auto,c_fit,w_730,h_730'
-    TEAM_CODE = "um"
-    INPUT_CSV = f'data_{TEAM_CODE}.csv'
-    IMAGE_FOLDER = f'{TEAM_CODE}_images'
-    download_images(INPUT_CSV, IMAGE_FOLDER, base_url=URL)
+    raise SystemExit(main())
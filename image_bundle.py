@@ -0,0 +1,181 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import zipfile
+
+import pandas as pd
+
+import download_helper
+
+"""
+Offline image bundles for audit stations on slow links.
+
+A bundle is one zip per report, built on a well-connected prefetch machine, holding one
+<Picture ID>.jpg member per image (stored, not compressed: JPEGs do not shrink) plus a
+bundle.json describing it. The auditor memory-maps the archive and reads members in place
+by offset, so nothing is extracted file by file.
+
+Build: python image_bundle.py report.csv [-o report.zip]
+Use:   put report.zip next to report.csv; auditorv2 picks it up when the CSV is loaded.
+"""
+
+BUNDLE_SUFFIX = ".zip"
+INDEX_FILE = "bundle.json"
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")  # zip local file header, 30 bytes
+
+def bundle_path_for(csv_path):
+    # The bundle that ships with a report sits next to it under the same base name
+    return f"{os.path.splitext(csv_path)[0]}{BUNDLE_SUFFIX}"
+
+class ImageBundle:
+    """
+    Read-only, memory-mapped view of a bundle. `identifier in bundle` is a dict lookup and
+    read() slices the image straight out of the mapping. Safe to share between threads.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.info = {}
+        self._members = {}  # identifier -> (data offset, size) for stored members
+        self._compressed = {}  # identifier -> ZipInfo for anything else
+        self._lock = threading.Lock()
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            # The zip directory (and any compressed member) is read through the file; stored images through the mapping
+            self._zip = zipfile.ZipFile(self._file)
+            self._load_index()
+        except BaseException:
+            self.close()
+            raise
+
+    def _load_index(self):
+        for member in self._zip.infolist():
+            if member.is_dir():
+                continue
+            if member.filename == INDEX_FILE:
+                self.info = json.loads(self._zip.read(member))
+                continue
+            identifier, ext = os.path.splitext(member.filename)
+            if ext.lower() not in (".jpg", ".png"):
+                continue
+            if member.compress_type == zipfile.ZIP_STORED and not member.flag_bits & 0x1:
+                header = _LOCAL_HEADER.unpack_from(self._map, member.header_offset)
+                start = member.header_offset + _LOCAL_HEADER.size + header[-2] + header[-1]
+                self._members[identifier] = (start, member.file_size)
+            else:
+                self._compressed[identifier] = member
+
+    @property
+    def base_url(self):
+        return self.info.get("base_url")
+
+    def read(self, identifier):
+        """
+        Returns the image bytes for identifier (a Picture ID), or None if the bundle does not have it.
+        """
+        identifier = str(identifier)
+        location = self._members.get(identifier)
+        if location is not None:
+            start, size = location
+            return self._map[start:start + size]
+        member = self._compressed.get(identifier)
+        if member is not None:
+            with self._lock:
+                return self._zip.read(member)
+        return None
+
+    def __contains__(self, identifier):
+        identifier = str(identifier)
+        return identifier in self._members or identifier in self._compressed
+
+    def __len__(self):
+        return len(self._members) + len(self._compressed)
+
+    def close(self):
+        # Lookups from threads still holding the bundle find nothing rather than a closed mapping
+        self._members, self._compressed = {}, {}
+        for resource in ("_zip", "_map", "_file"):
+            handle = getattr(self, resource, None)
+            if handle is not None:
+                handle.close()
+                setattr(self, resource, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_bundle(path):
+    """
+    Opens the bundle at path, or returns None (with a message) if it is missing or unreadable.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        bundle = ImageBundle(path)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        print(f"Ignoring image bundle {path}: {e}")
+        return None
+    print(f"Using image bundle {path} ({len(bundle)} images)")
+    return bundle
+
+def build_bundle(csv_file, bundle_path=None, item_col='Name', picture_id_col='Picture ID', base_url=download_helper.DEFAULT_BASE_URL,
+                 cache=None, **download_options):
+    """
+    Downloads every parent row's image of a report once per Picture ID and packs them into a
+    bundle at bundle_path (default: next to the CSV). Extra keyword arguments go to
+    download_helper.download_images. Returns the download manifest.
+    """
+    if bundle_path is None:
+        bundle_path = bundle_path_for(csv_file)
+    dataFile = download_helper._parent_rows(download_helper.read_csv(csv_file), item_col)
+    jobs = download_helper._build_jobs(dataFile, item_col, picture_id_col)
+    identifiers = list(dict.fromkeys(identifier for identifier, _ in jobs if isinstance(identifier, str) and identifier))
+    images = pd.DataFrame({item_col: identifiers, picture_id_col: identifiers})
+
+    folder = os.path.dirname(os.path.abspath(bundle_path))
+    with tempfile.TemporaryDirectory(prefix="bundle_", dir=folder) as scratch:
+        manifest = download_helper.download_images(images, scratch, item_col=item_col, picture_id_col=picture_id_col,
+                                                   base_url=base_url, cache=cache, **download_options)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=".", suffix=".part")
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_STORED) as archive:
+                for result in manifest:
+                    if result.ok:
+                        archive.write(os.path.join(scratch, f"{result.name}.jpg"), f"{result.identifier}.jpg")
+                archive.writestr(INDEX_FILE, json.dumps({
+                    "version": 1,
+                    "report": os.path.basename(str(csv_file)),
+                    "base_url": base_url,
+                    "images": sum(1 for r in manifest if r.ok),
+                    "missing": [r.identifier for r in manifest if not r.ok],
+                }))
+            os.replace(tmp_path, bundle_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    print(f"Wrote {bundle_path}: {sum(1 for r in manifest if r.ok)} images, {sum(1 for r in manifest if not r.ok)} missing")
+    return manifest
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Build an offline image bundle for a report.")
+    parser.add_argument("csv_file", help="report CSV the bundle is for")
+    parser.add_argument("-o", "--output", help="bundle path (default: next to the CSV with a .zip extension)")
+    parser.add_argument("--engine", choices=("threads", "async"), default="async" if download_helper.aiohttp is not None else "threads")
+    parser.add_argument("--concurrency", type=int, default=download_helper.DEFAULT_ASYNC_CONCURRENCY, help="maximum requests in flight")
+    parser.add_argument("--base-url", default=download_helper.DEFAULT_BASE_URL)
+    args = parser.parse_args(argv)
+    manifest = build_bundle(args.csv_file, args.output, base_url=args.base_url, engine=args.engine, concurrency=args.concurrency)
+    return 1 if any(not r.ok for r in manifest) else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,267 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+"""
+Persistent, content-addressed product image cache shared across audit sessions.
+
+Files are keyed by sha1(Picture ID + URL template) and sharded into two-character
+subfolders. index.json records every entry in least- to most-recently-used order,
+so lookups never scan directories and eviction just pops from the front.
+Several processes may share a cache (e.g. watch-mode prefetch next to the GUI): flush() merges
+the on-disk index under a lock file before writing it, and lookup misses re-read it.
+"""
+
+DEFAULT_CACHE_FOLDER = "ImageCache"
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2 GB
+INDEX_FILE = "index.json"
+INDEX_LOCK_TIMEOUT = 10.0
+INDEX_LOCK_STALE = 60.0  # a lock file older than this was left behind by a crashed process
+# Alternate product views (-2, -3, ...) live in their own cache inside the cache folder, so they
+# are evicted against their own budget and never push out the view-1 images a report needs
+VIEWS_SUBFOLDER = "views"
+DEFAULT_VIEWS_MAX_BYTES = 512 * 1024 ** 2  # 512 MB
+# Thumbnail-size previews likewise, so a preview pass over a report cannot evict full-size images
+PREVIEWS_SUBFOLDER = "previews"
+DEFAULT_PREVIEWS_MAX_BYTES = 256 * 1024 ** 2  # 256 MB
+
+def cache_key(identifier, base_url):
+    return hashlib.sha1(f"{base_url}\n{identifier}".encode("utf-8")).hexdigest()
+
+def link_or_copy(src, dest):
+    """
+    Hardlink src to dest (cheap, no extra disk space), falling back to a copy on
+    filesystems that do not support links. Replaces dest atomically if it exists.
+    """
+    tmp = f"{dest}.link"
+    try:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+        return True
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+
+@contextmanager
+def _file_lock(path, timeout=INDEX_LOCK_TIMEOUT, stale=INDEX_LOCK_STALE):
+    # Cross-process lock: whoever creates the lock file holds it. Raises TimeoutError (an OSError).
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > stale:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"{path} is held by another process")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+class ImageCache:
+    def __init__(self, folder=DEFAULT_CACHE_FOLDER, max_bytes=DEFAULT_MAX_BYTES):
+        self.folder = folder
+        self.max_bytes = int(max_bytes)
+        self.index_path = os.path.join(folder, INDEX_FILE)
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # key -> entry dict, LRU first
+        self._total_bytes = 0
+        self._dirty = False
+        self._removed = {}  # key -> when this process dropped it, until the next flush
+        self._index_mtime = None  # index.json as last read or written by this process
+        os.makedirs(folder, exist_ok=True)
+        self._merge(self._read_index())
+
+    # ---- index persistence ----
+    def _index_stamp(self):
+        try:
+            return os.stat(self.index_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_index(self):
+        self._index_mtime = self._index_stamp()
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data.get("entries", [])
+        except (OSError, ValueError):
+            return []
+
+    def _merge(self, entries):
+        """
+        Adopts entries from another copy of the index that are new or more recently used there.
+        Keys this process dropped stay dropped unless they were used again after that.
+        Returns True if anything changed.
+        """
+        changed = False
+        for entry in entries:
+            key = entry.get("key")
+            if not key:
+                continue
+            used = float(entry.get("last_used") or 0)
+            if key in self._removed and used <= self._removed[key]:
+                continue
+            mine = self._entries.get(key)
+            if mine is not None and float(mine.get("last_used") or 0) >= used:
+                continue
+            if mine is not None:
+                self._total_bytes -= int(mine.get("size", 0))
+            self._entries[key] = entry
+            self._total_bytes += int(entry.get("size", 0))
+            self._removed.pop(key, None)
+            changed = True
+        if changed:
+            self._entries = OrderedDict(sorted(self._entries.items(), key=lambda item: float(item[1].get("last_used") or 0)))
+        return changed
+
+    def _refresh(self):
+        # Picks up entries other processes flushed since the index was last read
+        if self._index_stamp() == self._index_mtime:
+            return False
+        return self._merge(self._read_index())
+
+    def flush(self):
+        """
+        Evicts down to the byte budget and, if anything changed, merges in the on-disk index
+        (holding its lock file) and writes index.json atomically.
+        """
+        with self._lock:
+            self._evict()
+            if not self._dirty:
+                return
+            tmp = f"{self.index_path}.tmp"
+            try:
+                with _file_lock(f"{self.index_path}.lock"):
+                    self._merge(self._read_index())
+                    self._evict()
+                    payload = {"version": 1, "entries": list(self._entries.values())}
+                    with open(tmp, "w", encoding="utf-8") as f:
+                        json.dump(payload, f)
+                    os.replace(tmp, self.index_path)
+                    self._index_mtime = self._index_stamp()
+                self._removed.clear()
+                self._dirty = False
+            except OSError as e:
+                print(f"Failed to write image cache index: {e}")
+
+    # ---- lookups ----
+    def path_for(self, identifier, base_url):
+        key = cache_key(identifier, base_url)
+        return os.path.join(self.folder, key[:2], f"{key}.jpg")
+
+    def get_entry(self, identifier, base_url):
+        with self._lock:
+            entry = self._entries.get(cache_key(identifier, base_url))
+            return dict(entry) if entry else None
+
+    def lookup(self, identifier, base_url):
+        """
+        Returns the cached file path for (identifier, base_url) and marks it recently used,
+        or None on a miss. Entries whose file vanished are dropped.
+        """
+        key = cache_key(identifier, base_url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._refresh():
+                entry = self._entries.get(key)
+            if entry is None:
+                return None
+            path = self.path_for(identifier, base_url)
+            if not os.path.exists(path):
+                self._drop(key)
+                return None
+            entry["last_used"] = time.time()
+            self._entries.move_to_end(key)
+            self._dirty = True
+            return path
+
+    def materialize(self, identifier, base_url, dest_path):
+        """
+        Makes the cached image available at dest_path (hardlink or copy). Returns False on a miss.
+        """
+        path = self.lookup(identifier, base_url)
+        if path is None:
+            return False
+        return link_or_copy(path, dest_path)
+
+    # ---- updates ----
+    def add(self, identifier, base_url, **extra):
+        """
+        Registers the file already written at path_for(identifier, base_url).
+        Extra keyword values are stored on the entry.
+        """
+        key = cache_key(identifier, base_url)
+        path = self.path_for(identifier, base_url)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self._total_bytes -= int(old.get("size", 0))
+            entry = {"key": key, "picture_id": str(identifier), "url": base_url, "size": size, "last_used": time.time()}
+            entry.update(extra)
+            self._entries[key] = entry
+            self._total_bytes += size
+            self._dirty = True
+            self._evict()
+
+    def update(self, identifier, base_url, **fields):
+        """
+        Updates stored fields (e.g. validators) on an existing entry.
+        """
+        with self._lock:
+            entry = self._entries.get(cache_key(identifier, base_url))
+            if entry is not None:
+                entry.update(fields)
+                self._dirty = True
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._total_bytes -= int(entry.get("size", 0))
+            self._removed[key] = time.time()
+            self._dirty = True
+        return entry
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, entry = next(iter(self._entries.items()))
+            self._drop(key)
+            try:
+                os.remove(os.path.join(self.folder, key[:2], f"{key}.jpg"))
+            except OSError:
+                pass
+
+    @property
+    def total_bytes(self):
+        return self._total_bytes
+
+    def __len__(self):
+        return len(self._entries)
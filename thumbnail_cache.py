@@ -0,0 +1,196 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+import image_cache
+
+"""
+Thumbnails of the bundled assets (team logos, color swatches) at the sizes the GUI shows them.
+
+Two tiers: an in-memory LRU of ready-to-display images keyed by (asset path, size), and a
+persistent folder of pre-resized PNGs so a new session does not decode full-size assets again.
+Disk entries are keyed by the asset's name within its folder and a hash of its bytes, so they
+survive the assets moving (a PyInstaller build unpacks them to a new folder with fresh mtimes on
+every launch) and a changed asset simply gets a new entry. The disk tier is not size-capped: it
+holds one small PNG per asset version and size.
+"""
+
+DEFAULT_THUMBNAIL_FOLDER = os.path.join(image_cache.DEFAULT_CACHE_FOLDER, "thumbnails")
+DEFAULT_MEMORY_ITEMS = 512
+_PNG_MODES = ("1", "L", "LA", "P", "RGB", "RGBA", "I")
+
+class ThumbnailCache:
+    """
+    get(path, size) returns the asset at path resized to size, passed through `make_display`
+    (e.g. ImageTk.PhotoImage, so the GUI gets an image it can draw directly) when given.
+    prepare(path, size) does the decoding part ahead of time from any thread, leaving get()
+    only the make_display call. Lookups are counted per tier for summary(); use it to size `memory_items`.
+    """
+    MAX_PREPARED = 64
+
+    def __init__(self, folder=DEFAULT_THUMBNAIL_FOLDER, memory_items=DEFAULT_MEMORY_ITEMS, make_display=None):
+        self.folder = folder
+        self.memory_items = max(int(memory_items), 1)
+        self.make_display = make_display
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # (path, size) -> (asset mtime, display image), LRU first
+        self._prepared = OrderedDict()  # (path, size) -> (asset mtime, resized image, tier it came from)
+        self._fingerprints = {}  # (path, asset size, asset mtime) -> disk key
+        self.counts = {"memory": 0, "disk": 0, "miss": 0}
+        try:
+            os.makedirs(folder, exist_ok=True)
+        except OSError as e:
+            print(f"Thumbnail folder unavailable, keeping thumbnails in memory only: {e}")
+            self.folder = None
+
+    def _disk_key(self, path):
+        # Folder-relative name plus content hash; each asset version is read once per session
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        stamp = (path, st.st_size, st.st_mtime_ns)
+        with self._lock:
+            key = self._fingerprints.get(stamp)
+        if key is not None:
+            return key
+        digest = hashlib.sha1()
+        digest.update(os.path.join(os.path.basename(os.path.dirname(os.path.abspath(path))), os.path.basename(path)).encode("utf-8"))
+        try:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        key = digest.hexdigest()
+        with self._lock:
+            self._fingerprints[stamp] = key
+        return key
+
+    def disk_path(self, path, size):
+        """
+        Where the disk tier keeps path at size, or None when the asset cannot be read.
+        """
+        key = self._disk_key(path)
+        if key is None:
+            return None
+        return os.path.join(self.folder, f"{size[0]}x{size[1]}", f"{key}.png")
+
+    def get(self, path, size):
+        """
+        The display image for path at size, or None if the asset is missing or unreadable.
+        """
+        size = (int(size[0]), int(size[1]))
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        key = (path, size)
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None and cached[0] == mtime:
+                self._memory.move_to_end(key)
+                self.counts["memory"] += 1
+                return cached[1]
+            prepared = self._prepared.pop(key, None)
+        if prepared is not None and prepared[0] == mtime:
+            image, tier = prepared[1], prepared[2]
+        else:
+            image, tier = self._resized(path, size, mtime)
+            if image is None:
+                return None
+        display = self.make_display(image) if self.make_display is not None else image
+        with self._lock:
+            self.counts[tier] += 1
+            self._memory[key] = (mtime, display)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+        return display
+
+    def prepare(self, path, size):
+        """
+        Decodes (or reads from the disk tier) the thumbnail for a later get(). Safe from any thread.
+        """
+        size = (int(size[0]), int(size[1]))
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        key = (path, size)
+        with self._lock:
+            cached = self._memory.get(key) or self._prepared.get(key)
+            if cached is not None and cached[0] == mtime:
+                return
+        image, tier = self._resized(path, size, mtime)
+        if image is None:
+            return
+        with self._lock:
+            self._prepared[key] = (mtime, image, tier)
+            while len(self._prepared) > self.MAX_PREPARED:
+                self._prepared.popitem(last=False)
+
+    def _resized(self, path, size, mtime):
+        # (image, tier): the disk tier's copy, else a fresh decode that is written back to it
+        image = self._load_disk(path, size)
+        if image is not None:
+            return image, "disk"
+        try:
+            with Image.open(path) as source:
+                source.draft("RGB", size)  # large JPEG assets decode at a reduced scale
+                image = source.resize(size, reducing_gap=3.0)
+        except (OSError, ValueError) as e:
+            print(f"Failed to load {path}: {e}")
+            return None, None
+        self._save_disk(image, path, size)
+        return image, "miss"
+
+    def _load_disk(self, path, size):
+        if self.folder is None:
+            return None
+        thumb_path = self.disk_path(path, size)
+        if thumb_path is None:
+            return None
+        try:
+            with Image.open(thumb_path) as thumb:
+                thumb.load()
+                return thumb.copy()
+        except (OSError, ValueError):
+            return None
+
+    def _save_disk(self, image, path, size):
+        if self.folder is None:
+            return
+        thumb_path = self.disk_path(path, size)
+        if thumb_path is None:
+            return
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(thumb_path), suffix=".part")
+            with os.fdopen(fd, "wb") as f:
+                (image if image.mode in _PNG_MODES else image.convert("RGBA")).save(f, "PNG")
+            os.replace(tmp_path, thumb_path)
+        except (OSError, ValueError) as e:
+            print(f"Failed to write thumbnail for {path}: {e}")
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+
+    def hit_rate(self):
+        with self._lock:
+            total = sum(self.counts.values())
+            return (self.counts["memory"] + self.counts["disk"]) / total if total else 0.0
+
+    def summary(self):
+        with self._lock:
+            counts, held = dict(self.counts), len(self._memory)
+        total = sum(counts.values())
+        return (f"{total} lookups, {self.hit_rate():.0%} hit rate ({counts['memory']} memory, {counts['disk']} disk, "
+                f"{counts['miss']} decoded), {held}/{self.memory_items} held in memory")